@@ -5,6 +5,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_admin import Admin
 
 from config import settings
+from admin.sessions import replica_session
 from admin.views import MODEL_VIEWS
 
 
@@ -14,6 +15,13 @@ app.config.update(settings.admin)
 db = SQLAlchemy(app)
 db.init_app(app)
 
+
+@app.teardown_appcontext
+def remove_replica_session(exception=None):
+    """Close replica session of finished app context."""
+    replica_session.remove()
+
+
 admin = Admin(app, url='/', name=settings.application, template_mode='bootstrap3')
 
 for name, model_view in MODEL_VIEWS.items():
@@ -0,0 +1,18 @@
+"""Admin database sessions module."""
+
+from functools import partial
+
+from flask import _app_ctx_stack
+from sqlalchemy.orm import scoped_session
+
+from db.manager import db_factory
+
+
+def _app_context_scope():
+    """Return current app context identity. Nested or sequential contexts of one thread get own sessions."""
+    return id(_app_ctx_stack.top)
+
+
+# Session of one healthy replica, chosen per app context, so one request reads from one replica.
+# Removed on app context teardown
+replica_session = scoped_session(partial(db_factory, master=False), scopefunc=_app_context_scope)
@@ -1,24 +1,159 @@
 """Model views module."""
 
+import threading
+
+from flask import has_request_context, request
 from flask_admin.contrib.sqla import ModelView
+from sqlalchemy import text, tuple_
 
 from admin.decorators import register_view
+from admin.sessions import replica_session
+from commons.cache import TTLCache
 from db import models
 
 
 MODEL_VIEWS = {}
 
+#: Endpoints which only read, they are served from replicas
+READ_ONLY_ENDPOINTS = frozenset(('index_view', 'details_view', 'export', 'ajax_lookup'))
+
 
 class BaseModelView(ModelView):
-    """Base model view."""
+    """Base model view.
+
+    Read-only endpoints query a replica, the master session view was created
+    with is used for create, edit and actions only.
+
+    """
 
     column_display_pk = True
     can_delete = False
     page_size = 100
 
+    @property
+    def session(self):
+        """Return replica session for read-only endpoints, master session otherwise."""
+        if has_request_context() and request.endpoint and request.endpoint.rsplit('.', 1)[-1] in READ_ONLY_ENDPOINTS:
+            return replica_session
+
+        return self._master_session
+
+    @session.setter
+    def session(self, session):
+        """Set master session."""
+        self._master_session = session
+
+
+class LargeTableModelView(BaseModelView):
+    """Model view of large tables.
+
+    List pages are sought by (sort column, primary key) of the previous page
+    last row instead of OFFSET. Boundaries of visited pages are remembered per
+    list parameters, so next/prev navigation never scans skipped rows, only a
+    jump to a not visited page falls back to OFFSET.
+
+    Rows count is estimated by planner above count_estimate_threshold rows,
+    exact count is computed only with ?exact_count=1 request argument.
+
+    """
+
+    simple_list_pager = True
+    count_estimate_threshold = 100000
+    # Shared by request threads, so it is accessed under lock only
+    page_boundaries = TTLCache(10000, 600)
+    page_boundaries_lock = threading.Lock()
+
+    def _exact_count(self, query):
+        """Count filtered rows."""
+        return query.order_by(None).count()
+
+    def _estimate_count(self, query, filtered):
+        """Estimate filtered rows count with table statistics or query plan."""
+        if not filtered:
+            count = self.session.execute(
+                text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)'),
+                {'table': self.model.__table__.fullname}
+            ).scalar()
+            # Never analyzed table has -1 reltuples
+            return max(count or 0, 0)
+
+        compiled = query.order_by(None).statement.compile(dialect=self.session.get_bind().dialect)
+        plan = self.session.connection().execute('EXPLAIN (FORMAT JSON) ' + compiled.string, compiled.params).scalar()
+
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _count(self, query, filtered):
+        """Return exact count on request or for small results, estimated one otherwise."""
+        if request.args.get('exact_count'):
+            return self._exact_count(query)
+
+        count = self._estimate_count(query, filtered)
+        if count < self.count_estimate_threshold:
+            return self._exact_count(query)
+
+        return count
+
+    def _keyset_order(self, sort_column):
+        """Return seek columns or None if sorting can not be sought."""
+        primary_key = self.model.__mapper__.primary_key[0]
+
+        if sort_column is None:
+            return None if self.column_default_sort else [primary_key]
+
+        column = self.model.__table__.c.get(sort_column)
+        if column is None or column.nullable:
+            return None
+
+        return [primary_key] if column is primary_key else [column, primary_key]
+
+    def get_list(self, page, sort_column, sort_desc, search, filters, execute=True, page_size=None):
+        """Return rows count and page of rows sought from previous page boundary."""
+        if page_size is None:
+            page_size = self.page_size
+        page = page or 0
+
+        # Filtered and sorted query without pagination
+        _, query = super().get_list(None, sort_column, sort_desc, search, filters, execute=False, page_size=0)
+        count = self._count(query, bool(search or filters)) if execute else None
+
+        order = self._keyset_order(sort_column) if page_size else None
+        list_key = (self.endpoint, sort_column, sort_desc, search, repr(filters), page_size)
+
+        if order is not None:
+            query = query.order_by(*[column.desc() if sort_desc else column for column in order])
+
+            boundary = None
+            if page:
+                with self.page_boundaries_lock:
+                    boundary = self.page_boundaries.get(list_key + (page, ))
+            if boundary is not None:
+                seek = tuple_(*order) < tuple_(*boundary) if sort_desc else tuple_(*order) > tuple_(*boundary)
+                query = query.filter(seek)
+            elif page:
+                query = query.offset(page * page_size)
+        elif page and page_size:
+            query = query.offset(page * page_size)
+
+        if page_size:
+            query = query.limit(page_size)
+
+        if not execute:
+            return count, query
+
+        rows = query.all()
+
+        if order is not None and len(rows) == page_size:
+            mapper = self.model.__mapper__
+            last = rows[-1]
+            boundary = tuple(getattr(last, mapper.get_property_by_column(column).key) for column in order)
+            with self.page_boundaries_lock:
+                self.page_boundaries.set(list_key + (page + 1, ), boundary)
+
+        return count, rows
+
 
 @register_view(MODEL_VIEWS)
-class UserView(BaseModelView):
+class UserView(LargeTableModelView):
     """User model view."""
 
     model = models.User
@@ -32,7 +167,13 @@ class CategoryView(BaseModelView):
 
 
 @register_view(MODEL_VIEWS)
-class ArticleView(BaseModelView):
+class ArticleView(LargeTableModelView):
     """Article model view."""
 
     model = models.Article
+
+    # Kept up to date by database trigger
+    column_exclude_list = ('search_vector', )
+    column_details_exclude_list = ('search_vector', )
+    column_export_exclude_list = ('search_vector', )
+    form_excluded_columns = ('search_vector', )
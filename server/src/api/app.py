@@ -1,18 +1,53 @@
 """Public API application module."""
 
+from functools import partial
+
 import structlog
 
-from aiohttp import web
+from aiohttp import web, ClientSession, TCPConnector
+from config import settings
 from db import db_manager
-from api.middlewares import error_middleware, auth_middleware
+from api.auth import TokenAuthenticator, JWTAuthenticator
+from api.cache import CacheScope, ResponseCache, create_cache_backend
+from api.constants import AuthMode
+from api.metrics import RouteMetrics, metrics_middleware, collect_app
+from api.middlewares import (
+    error_middleware, policy_middleware, auth_middleware, cache_middleware, coalesce_middleware
+)
+from api.policies import RateLimit, RoutePolicy
+from commons.batch import BatchWriter
+from commons.credentials import CredentialService, create_password_hasher
+from commons.metrics import REGISTRY
+from commons.profiler import SamplingProfiler
+from commons.singleflight import SingleFlight
 from api.v1.handlers import (
-    ping, auth, register, check
+    ping, auth, logout, register, check, metrics, profile, articles, categories, export, search
 )
 
 
 logger = structlog.getLogger('api.' + __name__)
 
 
+ROUTES = (
+    ('GET', '/api/v1/ping/', ping.ping, RoutePolicy(auth=False, coalesce=False)),
+    ('POST', '/api/v1/login/', auth.auth, RoutePolicy(auth=False, rate_limit=RateLimit.AUTH, max_body_size=4096)),
+    ('POST', '/api/v1/logout/', logout.logout, RoutePolicy(max_body_size=4096)),
+    ('POST', '/api/v1/register/', register.register, RoutePolicy(
+        auth=False, rate_limit=RateLimit.AUTH, max_body_size=4096
+    )),
+    ('POST', '/api/v1/register/bulk/', register.bulk_register, RoutePolicy(
+        rate_limit=RateLimit.AUTH, max_body_size=1024 * 1024
+    )),
+    ('GET', '/api/v1/articles/', articles.articles, RoutePolicy(cacheable=True, cache_scope=CacheScope.PUBLIC)),
+    ('GET', '/api/v1/articles/export/', export.export_articles, RoutePolicy(coalesce=False)),
+    ('GET', '/api/v1/articles/search/', search.search, RoutePolicy(cacheable=True, cache_scope=CacheScope.PUBLIC)),
+    ('GET', '/api/v1/categories/', categories.categories, RoutePolicy(cacheable=True, cache_scope=CacheScope.PUBLIC)),
+    ('GET', '/api/v1/check/', check.check, RoutePolicy(auth=False, coalesce=False)),
+    ('GET', '/api/v1/metrics/', metrics.metrics, RoutePolicy(auth=False, coalesce=False)),
+    ('GET', '/api/v1/profile/', profile.profile, RoutePolicy(auth=False, coalesce=False)),
+)
+
+
 def init_server(loop=None):
     """Configure server before starting.
 
@@ -21,16 +56,41 @@ def init_server(loop=None):
 
     """
     app = web.Application(middlewares=[
+        metrics_middleware,
         error_middleware,
         web.normalize_path_middleware(
             append_slash=True,
             merge_slashes=True,
             redirect_class=web.HTTPPermanentRedirect
         ),
-        auth_middleware
+        policy_middleware,
+        auth_middleware,
+        cache_middleware,
+        coalesce_middleware
     ])
     add_routes(app)
 
+    app.request_coalescer = SingleFlight()
+    app.profiler = SamplingProfiler(settings.profiler.interval)
+    app.credentials = CredentialService(
+        create_password_hasher(settings.credentials),
+        settings.credentials.executor,
+        settings.credentials.workers,
+        settings.credentials.queue_size,
+        settings.credentials.bulk_chunk_size
+    )
+
+    if settings.auth.mode == AuthMode.JWT:
+        app.authenticator = JWTAuthenticator(
+            settings.auth.token_ttl,
+            settings.auth.revocation_sync_interval
+        )
+    else:
+        app.authenticator = TokenAuthenticator(
+            settings.auth.token_cache.size,
+            settings.auth.token_cache.ttl
+        )
+
     async def init(app):
         """Configure app before starting server.
 
@@ -39,7 +99,22 @@ def init_server(loop=None):
 
         """
         app.db = await db_manager.async_master(loop)
+        app.db_replicas = await db_manager.async_slaves(loop)
         app.logger = logger
+        app.response_cache = ResponseCache(await create_cache_backend(settings.cache, loop))
+        app.client_session = ClientSession(connector=TCPConnector(verify_ssl=False), raise_for_status=True)
+        app.upstream_probe = check.UpstreamProbe(
+            app.client_session, settings.check.url, settings.check.ttl, settings.check.timeout
+        )
+        app.token_writer = BatchWriter(
+            partial(auth.write_tokens, app),
+            settings.auth.token_writer.max_size,
+            settings.auth.token_writer.max_delay
+        )
+        await app.authenticator.startup(app)
+
+        app.metrics_collector = partial(collect_app, app)
+        REGISTRY.add_collector(app.metrics_collector)
 
     app.on_startup.append(init)
 
@@ -50,6 +125,12 @@ def init_server(loop=None):
         :return: Server app
 
         """
+        REGISTRY.remove_collector(app.metrics_collector)
+        await app.authenticator.shutdown()
+        await app.token_writer.close()
+        await app.response_cache.close()
+        await app.client_session.close()
+        app.credentials.shutdown()
         await db_manager.async_close_all()
 
     app.on_shutdown.append(cleanup)
@@ -58,12 +139,17 @@ def init_server(loop=None):
 
 
 def add_routes(app):
-    """Configure server application endpoints."""
-
-    app.router.add_get('/api/v1/ping/', ping.ping)
-    app.router.add_post('/api/v1/login/', auth.auth)
-    app.router.add_post('/api/v1/register/', register.register)
-    app.router.add_get('/api/v1/check/', check.check)
+    """Configure server application endpoints and compile their policies and metrics."""
+    app.route_policies = {}
+    app.route_metrics = {}
+
+    for method, path, handler, policy in ROUTES:
+        resource = app.router.add_resource(path)
+        # GET routes answer HEAD as well, like router.add_get() does, under the same policy
+        for route_method in (method, 'HEAD') if method == 'GET' else (method, ):
+            route = resource.add_route(route_method, handler)
+            app.route_policies[route] = policy
+            app.route_metrics[route] = RouteMetrics(route_method, path)
 
 
 app = init_server()
@@ -0,0 +1,264 @@
+"""Public API authentication module."""
+
+import asyncio
+import time
+
+import jwt
+import structlog
+from sqlalchemy import bindparam, func, select, delete
+from sqlalchemy.dialects.postgresql import insert
+
+from commons.cache import TTLCache
+from commons.helpers import encode_token
+from db.models import User, TokenRevocation
+from db.queries import Query
+
+
+__all__ = (
+    'PRINCIPAL_COLUMNS',
+    'TokenAuthenticator',
+    'RevocationList',
+    'JWTAuthenticator',
+)
+
+
+logger = structlog.getLogger('api.' + __name__)
+
+
+#: User columns exposed to handlers as authenticated principal
+PRINCIPAL_COLUMNS = (User.id, User.login, User.first_name, User.last_name)
+
+PRINCIPAL_BY_TOKEN = Query(
+    select(list(PRINCIPAL_COLUMNS)).where(User.token == bindparam('token'))
+)
+
+DELETE_EXPIRED_REVOCATIONS = Query(
+    delete(TokenRevocation).where(TokenRevocation.not_before <= bindparam('horizon'))
+)
+
+REVOCATIONS = Query(
+    select([TokenRevocation.user_id, TokenRevocation.not_before])
+)
+
+_revoke = insert(TokenRevocation).values(user_id=bindparam('b_user_id'), not_before=bindparam('b_not_before'))
+REVOKE_USER_TOKENS = Query(
+    _revoke.on_conflict_do_update(
+        index_elements=[TokenRevocation.user_id],
+        set_={'not_before': func.greatest(TokenRevocation.not_before, _revoke.excluded.not_before)}
+    )
+)
+
+
+class TokenAuthenticator:
+    """Resolve authorization tokens to users.
+
+    Resolved users are kept in a bounded TTL cache, so the app asyncpg pool
+    is queried only for tokens which were not seen recently.
+
+    """
+
+    __slots__ = ('_cache', )
+
+    def __init__(self, size, ttl):
+        """Initialize TokenAuthenticator instance.
+
+        :param size: Maximum number of cached tokens
+        :param ttl: Cached token time to live in seconds
+
+        """
+        self._cache = TTLCache(size, ttl)
+
+    async def authenticate(self, app, token):
+        """Return principal for token or None if token is unknown.
+
+        :param app: Server app
+        :param token: Authorization token
+        :return: Principal dict
+
+        """
+        principal = self._cache.get(token)
+        if principal is not None:
+            return principal
+
+        async with app.db.acquire() as connection:
+            user = await PRINCIPAL_BY_TOKEN.fetchrow(connection, token=token)
+
+        if not user:
+            return None
+
+        return self.remember(token, user)
+
+    def remember(self, token, user):
+        """Cache principal for just issued token.
+
+        :param token: Authorization token
+        :param user: User record
+        :return: Principal dict
+
+        """
+        principal = {column.name: user[column.name] for column in PRINCIPAL_COLUMNS}
+        self._cache.set(token, principal)
+
+        return principal
+
+    def forget(self, token):
+        """Drop token from cache, e.g. after it was replaced by a new login."""
+        self._cache.pop(token)
+
+    def token_claims(self, user):
+        """Tokens are resolved through database in this mode, no claims are needed."""
+        return {}
+
+    async def revoke(self, connection, user_id):
+        """Revoke all user tokens. Clearing User.token is enough in this mode."""
+
+    async def startup(self, app):
+        """Start authenticator background work."""
+
+    async def shutdown(self):
+        """Stop authenticator background work."""
+
+
+class RevocationList:
+    """In-memory per user lower bound of valid token issue time.
+
+    Tokens issued before the bound are revoked. Bounds older than token ttl are
+    dropped on sync, because every token they revoke has already expired.
+
+    """
+
+    __slots__ = ('_not_before', )
+
+    def __init__(self):
+        """Initialize RevocationList instance."""
+        self._not_before = {}
+
+    def revoke(self, user_id, not_before):
+        """Revoke user tokens issued up to not_before timestamp."""
+        if not_before > self._not_before.get(user_id, 0):
+            self._not_before[user_id] = not_before
+
+    def is_revoked(self, user_id, created_at):
+        """Check if token issued at created_at was revoked."""
+        return created_at <= self._not_before.get(user_id, 0)
+
+    async def sync(self, app, ttl):
+        """Replace bounds with the ones stored in database.
+
+        :param app: Server app
+        :param ttl: Token time to live in seconds
+
+        """
+        horizon = time.time() - ttl
+
+        async with app.db.acquire() as connection:
+            await DELETE_EXPIRED_REVOCATIONS.execute(connection, horizon=horizon)
+            rows = await REVOCATIONS.fetch(connection)
+
+        not_before = {row['user_id']: row['not_before'] for row in rows}
+        # Keep local bounds raised after the rows were read
+        for user_id, bound in self._not_before.items():
+            if bound > max(horizon, not_before.get(user_id, 0)):
+                not_before[user_id] = bound
+
+        self._not_before = not_before
+
+    def __len__(self):
+        """Return number of users with revoked tokens."""
+        return len(self._not_before)
+
+
+class JWTAuthenticator:
+    """Verify authorization tokens signature and age in-process.
+
+    Database is used only to periodically sync revocations made by other workers.
+
+    """
+
+    __slots__ = ('_ttl', '_sync_interval', '_sync_task', 'revocations')
+
+    def __init__(self, ttl, sync_interval):
+        """Initialize JWTAuthenticator instance.
+
+        :param ttl: Token time to live in seconds
+        :param sync_interval: Revocations sync interval in seconds
+
+        """
+        self._ttl = ttl
+        self._sync_interval = sync_interval
+        self._sync_task = None
+        self.revocations = RevocationList()
+
+    async def authenticate(self, app, token):
+        """Return principal for valid token or None.
+
+        :param app: Server app
+        :param token: Authorization token
+        :return: Principal dict
+
+        """
+        try:
+            claims = encode_token(token)
+        except jwt.InvalidTokenError:
+            return None
+
+        user_id = claims.get('user_id')
+        created_at = claims.get('created_at')
+        if type(user_id) is not int or type(created_at) not in (int, float):
+            return None
+
+        if created_at + self._ttl <= time.time():
+            return None
+
+        if self.revocations.is_revoked(user_id, created_at):
+            return None
+
+        principal = {column.name: claims.get(column.name) for column in PRINCIPAL_COLUMNS}
+        principal['id'] = user_id
+        return principal
+
+    def remember(self, token, user):
+        """Return principal for just issued token."""
+        return {column.name: user[column.name] for column in PRINCIPAL_COLUMNS}
+
+    def token_claims(self, user):
+        """Return principal columns carried by token, so it is verified without database."""
+        return {column.name: user[column.name] for column in PRINCIPAL_COLUMNS if column.name != 'id'}
+
+    def forget(self, token):
+        """Nothing is cached per token in this mode."""
+
+    async def revoke(self, connection, user_id):
+        """Revoke all user tokens issued up to now.
+
+        :param connection: Database connection
+        :param user_id: User identifier
+
+        """
+        # Sub-second bound, so a login right after logout is not revoked
+        not_before = time.time()
+
+        await REVOKE_USER_TOKENS.execute(connection, b_user_id=user_id, b_not_before=not_before)
+        self.revocations.revoke(user_id, not_before)
+
+    async def startup(self, app):
+        """Load revocations and start syncing them periodically."""
+        await self.revocations.sync(app, self._ttl)
+        self._sync_task = asyncio.ensure_future(self._sync_periodically(app))
+
+    async def shutdown(self):
+        """Stop revocations syncing."""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+
+    async def _sync_periodically(self, app):
+        """Sync revocations every sync interval."""
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                await self.revocations.sync(app, self._ttl)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Token revocations sync failed')
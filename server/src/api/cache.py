@@ -0,0 +1,197 @@
+"""Public API response cache module."""
+
+from urllib.parse import urlencode
+
+import structlog
+from aiohttp import web
+
+from commons.cache import TTLCache
+from commons.helpers import Constants
+
+
+__all__ = (
+    'CacheBackend',
+    'CacheScope',
+    'MemoryCacheBackend',
+    'RedisCacheBackend',
+    'ResponseCache',
+    'create_cache_backend',
+)
+
+
+logger = structlog.getLogger('api.' + __name__)
+
+
+class CacheBackend(Constants):
+    """Response cache backends."""
+
+    MEMORY = 'memory'
+    REDIS = 'redis'
+
+
+class CacheScope(Constants):
+    """Cached response visibility."""
+
+    PUBLIC = 'public'
+    PRINCIPAL = 'principal'
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache backend with TTL and size cap."""
+
+    __slots__ = ('_cache', )
+
+    def __init__(self, size, ttl):
+        """Initialize MemoryCacheBackend instance.
+
+        :param size: Maximum number of cached responses
+        :param ttl: Default cached response time to live in seconds
+
+        """
+        self._cache = TTLCache(size, ttl)
+
+    async def get(self, key):
+        """Return cached value or None."""
+        return self._cache.get(key)
+
+    async def set(self, key, value, ttl=None):
+        """Cache value for ttl seconds."""
+        self._cache.set(key, value, ttl)
+
+    def stats(self):
+        """Return hit/miss/eviction counters."""
+        return {'hits': self._cache.hits, 'misses': self._cache.misses, 'evictions': self._cache.evictions}
+
+    async def close(self):
+        """Drop cached values."""
+        self._cache.clear()
+
+
+class RedisCacheBackend:
+    """Redis cache backend. Evictions are counted by Redis itself (INFO stats evicted_keys)."""
+
+    __slots__ = ('_redis', '_ttl', 'hits', 'misses')
+
+    def __init__(self, redis, ttl):
+        """Initialize RedisCacheBackend instance.
+
+        :param redis: aioredis connections pool
+        :param ttl: Default cached response time to live in seconds
+
+        """
+        self._redis = redis
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    async def create(cls, host, port, db, ttl, loop=None):
+        """Connect to Redis and create backend."""
+        import aioredis
+
+        redis = await aioredis.create_redis_pool((host, port), db=db, loop=loop)
+        return cls(redis, ttl)
+
+    async def get(self, key):
+        """Return cached value or None."""
+        value = await self._redis.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    async def set(self, key, value, ttl=None):
+        """Cache value for ttl seconds."""
+        await self._redis.set(key, value, expire=self._ttl if ttl is None else ttl)
+
+    def stats(self):
+        """Return hit/miss counters. Evictions are counted by Redis itself."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    async def close(self):
+        """Close Redis connections."""
+        self._redis.close()
+        await self._redis.wait_closed()
+
+
+async def create_cache_backend(config, loop=None):
+    """Create response cache backend from cache settings.
+
+    :param config: Cache settings
+    :param loop: Event loop
+    :return: Cache backend
+
+    """
+    if config.backend == CacheBackend.REDIS:
+        from config import settings
+
+        return await RedisCacheBackend.create(
+            settings.redis.host, settings.redis.port, settings.redis.db.cache, config.ttl, loop=loop
+        )
+
+    return MemoryCacheBackend(config.size, config.ttl)
+
+
+class ResponseCache:
+    """Cache of successful GET responses bodies."""
+
+    __slots__ = ('backend', )
+
+    KEY_PREFIX = 'response:'
+
+    def __init__(self, backend):
+        """Initialize ResponseCache instance.
+
+        :param backend: Cache backend
+
+        """
+        self.backend = backend
+
+    def key(self, request, policy):
+        """Build cache key from path, normalized query and principal when response is private."""
+        # Values are encoded again, so decoded separators can not build the key of another query
+        query = urlencode(sorted(request.query.items()))
+        key = f'{self.KEY_PREFIX}{request.rel_url.raw_path}?{query}'
+
+        if policy.cache_scope == CacheScope.PRINCIPAL:
+            user = request.get('user')
+            key = f'{key}#{user["id"] if user else ""}'
+
+        return key
+
+    async def get(self, key):
+        """Return cached response or None. Backend failures are treated as misses."""
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            logger.exception('Response cache read failed')
+            return None
+
+        if value is None:
+            return None
+
+        header, body = value.split(b'\n', 1)
+        status, content_type = header.decode('utf-8').split(' ', 1)
+
+        return web.Response(body=body, status=int(status), headers={'Content-Type': content_type})
+
+    async def set(self, key, response, ttl=None):
+        """Cache response if it is a complete successful response."""
+        if response.status != 200 or response.prepared or not isinstance(response.body, bytes):
+            return
+
+        header = f'{response.status} {response.headers.get("Content-Type", "")}\n'.encode('utf-8')
+        try:
+            await self.backend.set(key, header + response.body, ttl)
+        except Exception:
+            logger.exception('Response cache write failed')
+
+    def stats(self):
+        """Return hit/miss/eviction counters."""
+        return self.backend.stats()
+
+    async def close(self):
+        """Close cache backend."""
+        await self.backend.close()
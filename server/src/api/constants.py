@@ -3,8 +3,12 @@
 from aiohttp.web_exceptions import (
     HTTPUnsupportedMediaType,
     HTTPBadRequest,
+    HTTPForbidden,
+    HTTPConflict,
     HTTPInternalServerError,
     HTTPUnprocessableEntity,
+    HTTPRequestEntityTooLarge,
+    HTTPServiceUnavailable,
 )
 
 from commons.helpers import Constants
@@ -15,6 +19,7 @@ class Headers(Constants):
     """Acceptable requests headers."""
 
     CONTENT_TYPE = 'Content-Type'
+    ADMIN_TOKEN = 'X-Admin-Token'
 
 
 class ContentType(Constants):
@@ -22,6 +27,7 @@ class ContentType(Constants):
 
     JSON = 'application/json'
     FORM_MULTIPART = 'multipart/form-data'
+    NDJSON = 'application/x-ndjson'
 
 
 class Errors(Constants):
@@ -35,6 +41,11 @@ class Errors(Constants):
     UNPROCESSABLE_ENTITY = Error(4222, HTTPUnprocessableEntity, 'Request content not in JSON')
     WRONG_PARAMETER_TYPE = Error(4004, HTTPBadRequest, 'Wrong type for parameter {param}. Should be {p_type}')
     WRONG_JSON_STRUCTURE = Error(4007, HTTPBadRequest, 'Wrong JSON structure. Errors: {errors}')
+    WRONG_PARAMETER_VALUE = Error(4008, HTTPBadRequest, 'Wrong value for parameter {param}')
+    REQUEST_TOO_LARGE = Error(4132, HTTPRequestEntityTooLarge, 'Request body is too large. Max size: {max_size}')
+    ADMIN_TOKEN_REQUIRED = Error(4032, HTTPForbidden, 'Valid admin token required')
+    PROFILER_BUSY = Error(4092, HTTPConflict, 'Profiler is already running')
+    CREDENTIALS_BUSY = Error(5032, HTTPServiceUnavailable, 'Too many login attempts in progress. Retry later')
 
 
 class Status(Constants):
@@ -44,12 +55,16 @@ class Status(Constants):
     ERROR = 'error'
 
 
-class UnauthorizedEndpoints(Constants):
-    """Unauthorized endpoints."""
+class BulkStatus(Constants):
+    """Bulk operations item statuses."""
 
-    ROUTES = [
-        'ping/', 'ping',
-        'login/', 'login',
-        'register/', 'register',
-        'check/', 'check'
-    ]
+    CREATED = 'created'
+    CONFLICT = 'conflict'
+    INVALID = 'invalid'
+
+
+class AuthMode(Constants):
+    """Authorization token verification modes."""
+
+    DB = 'db'
+    JWT = 'jwt'
@@ -0,0 +1,255 @@
+"""Public API load generator module."""
+
+import asyncio
+import time
+import uuid
+
+import ujson
+from aiohttp import web, ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
+
+from api.constants import Status
+from commons.helpers import Constants
+from commons.latency import LatencyHistogram
+
+
+__all__ = (
+    'LoadMode',
+    'LoadResult',
+    'SCENARIOS',
+    'run_load',
+    'create_stub_upstream',
+)
+
+
+class LoadMode(Constants):
+    """Load generation modes."""
+
+    # Requests start at fixed rate whatever the server latency is
+    OPEN = 'open'
+    # Fixed number of clients send next request after previous response
+    CLOSED = 'closed'
+
+
+class LoadResult:
+    """Latencies and statuses of load run."""
+
+    __slots__ = ('latency', 'corrected', 'requests', 'statuses', 'errors', 'elapsed')
+
+    def __init__(self):
+        """Initialize LoadResult instance."""
+        # Scenario iteration latency, from intended start in open loop mode
+        self.latency = LatencyHistogram()
+        # Closed loop latency with coordinated omission correction
+        self.corrected = LatencyHistogram()
+        # Latency of every scenario request, from actual send
+        self.requests = {}
+        self.statuses = {}
+        self.errors = {}
+        self.elapsed = 0
+
+    def record_request(self, name, status, seconds):
+        """Record scenario request latency and status."""
+        histogram = self.requests.get(name)
+        if histogram is None:
+            histogram = self.requests[name] = LatencyHistogram()
+
+        histogram.record(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def record_error(self, error):
+        """Record failed scenario iteration."""
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def to_dict(self):
+        """Represent result as JSON serializable dict."""
+        return {
+            'elapsed': self.elapsed,
+            'throughput': self.latency.count / self.elapsed if self.elapsed else 0,
+            'latency': self.latency.to_dict(),
+            'corrected': self.corrected.to_dict() if self.corrected.count else None,
+            'requests': {name: histogram.to_dict() for name, histogram in self.requests.items()},
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'errors': self.errors,
+        }
+
+
+class LoadClient:
+    """Scenario HTTP client timing every request."""
+
+    __slots__ = ('_session', '_base_url', '_result')
+
+    def __init__(self, session, base_url, result):
+        """Initialize LoadClient instance.
+
+        :param session: Client session shared by all scenario iterations
+        :param base_url: API base url
+        :param result: Load result
+
+        """
+        self._session = session
+        self._base_url = base_url
+        self._result = result
+
+    async def request(self, name, method, path, token=None, **kwargs):
+        """Send request and return (status, response cookies, decoded JSON body)."""
+        cookies = {'token': token} if token else None
+        started = time.perf_counter()
+
+        async with self._session.request(method, self._base_url + path, cookies=cookies, **kwargs) as response:
+            body = await response.read()
+
+        self._result.record_request(name, response.status, time.perf_counter() - started)
+
+        data = ujson.loads(body) if body and response.content_type == 'application/json' else None
+        return response.status, response.cookies, data
+
+
+async def ping_scenario(client):
+    """Call liveness endpoint."""
+    await client.request('ping', 'GET', '/api/v1/ping/')
+
+
+async def check_scenario(client):
+    """Call upstream liveness endpoint."""
+    await client.request('check', 'GET', '/api/v1/check/')
+
+
+async def session_scenario(client):
+    """Register new user, log in and call authenticated endpoint."""
+    login = uuid.uuid4().hex
+    credentials = {'login': login, 'password': login}
+
+    await client.request('register', 'POST', '/api/v1/register/', json={
+        'first_name': 'Load', 'last_name': 'Test', **credentials
+    })
+
+    status, cookies, data = await client.request('login', 'POST', '/api/v1/login/', json=credentials)
+    if 'token' not in cookies:
+        raise RuntimeError(f'Login failed: {status} {data}')
+
+    await client.request('logout', 'POST', '/api/v1/logout/', token=cookies['token'].value)
+
+
+SCENARIOS = {
+    'ping': ping_scenario,
+    'check': check_scenario,
+    'session': session_scenario,
+}
+
+
+async def _iterate(scenario, client, result, started_at, loop):
+    """Run scenario iteration and return its latency from started_at."""
+    try:
+        await scenario(client)
+    except Exception as e:
+        result.record_error(e)
+
+    return loop.time() - started_at
+
+
+async def _open_loop(scenario, client, result, rate, duration, concurrency, loop):
+    """Start iterations every 1 / rate seconds whatever the server latency is.
+
+    Latency is measured from intended start time, so time spent waiting for a
+    free connection or for the generator itself is not omitted.
+
+    """
+    interval = 1 / rate
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+
+    async def iteration(intended_at):
+        async with semaphore:
+            latency = await _iterate(scenario, client, result, intended_at, loop)
+        result.latency.record(latency)
+
+    started_at = loop.time()
+    sent = 0
+    while sent * interval < duration:
+        intended_at = started_at + sent * interval
+
+        delay = intended_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        task = asyncio.ensure_future(iteration(intended_at))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        sent += 1
+
+    if pending:
+        await asyncio.wait(pending)
+
+
+async def _closed_loop(scenario, client, result, rate, duration, concurrency, loop):
+    """Run concurrency clients which send next iteration after previous one completes.
+
+    With rate every client is paced to rate / concurrency iterations per second and
+    iterations it could not start in time are accounted by coordinated omission correction.
+
+    """
+    expected_interval = concurrency / rate if rate else None
+    finish_at = loop.time() + duration
+
+    async def worker():
+        next_at = loop.time()
+        while next_at < finish_at:
+            started_at = loop.time()
+            latency = await _iterate(scenario, client, result, started_at, loop)
+            result.latency.record(latency)
+
+            if expected_interval:
+                result.corrected.record_corrected(latency, expected_interval)
+                next_at = max(next_at + expected_interval, loop.time())
+                await asyncio.sleep(next_at - loop.time())
+            else:
+                next_at = loop.time()
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+
+async def run_load(base_url, scenario, mode=LoadMode.OPEN, rate=100, duration=10, concurrency=64, timeout=30,
+                   loop=None):
+    """Generate load on API.
+
+    :param base_url: API base url, e.g. http://127.0.0.1:8080
+    :param scenario: Scenario name
+    :param mode: Open or closed loop
+    :param rate: Target iterations per second. Optional in closed loop mode
+    :param duration: Load duration in seconds
+    :param concurrency: Maximum concurrent iterations and connections
+    :param timeout: Request timeout in seconds
+    :param loop: Event loop
+    :return: Load result
+
+    """
+    loop = loop or asyncio.get_event_loop()
+    result = LoadResult()
+    run = _open_loop if mode == LoadMode.OPEN else _closed_loop
+
+    # One session keeps connections alive between iterations. Cookies are passed per request,
+    # so concurrent session scenario iterations do not share tokens
+    async with ClientSession(
+        connector=TCPConnector(limit=concurrency, verify_ssl=False),
+        cookie_jar=DummyCookieJar(),
+        timeout=ClientTimeout(total=timeout)
+    ) as session:
+        client = LoadClient(session, base_url.rstrip('/'), result)
+
+        started_at = time.perf_counter()
+        await run(SCENARIOS[scenario], client, result, rate, duration, concurrency, loop)
+        result.elapsed = time.perf_counter() - started_at
+
+    return result
+
+
+def create_stub_upstream():
+    """Create upstream stand-in answering /api/v1/ping/ probed by /api/v1/check/."""
+    async def ping(request):
+        return web.json_response({'status': Status.OK})
+
+    app = web.Application()
+    app.router.add_get('/api/v1/ping/', ping)
+
+    return app
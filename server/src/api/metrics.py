@@ -0,0 +1,108 @@
+"""Public API requests metrics module."""
+
+import time
+
+from aiohttp import web
+
+from commons.metrics import REGISTRY, Counter, Gauge, Histogram
+
+
+__all__ = (
+    'RouteMetrics',
+    'SYSTEM_ROUTE_METRICS',
+    'metrics_middleware',
+    'collect_app',
+)
+
+
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'Request handling latency.', ('method', 'route', 'status')
+))
+REQUESTS = REGISTRY.register(Counter(
+    'http_requests_total', 'Handled requests.', ('method', 'route', 'status')
+))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    'http_requests_in_flight', 'Requests being handled.', ('method', 'route')
+))
+REQUEST_BYTES = REGISTRY.register(Counter(
+    'http_request_bytes_total', 'Request bodies size by Content-Length.', ('method', 'route')
+))
+RESPONSE_BYTES = REGISTRY.register(Counter(
+    'http_response_bytes_total', 'Response bodies size. Streamed responses are not counted.', ('method', 'route')
+))
+
+
+class RouteMetrics:
+    """Metrics children of one route, resolved once at startup."""
+
+    __slots__ = ('latency', 'requests', 'in_flight', 'request_bytes', 'response_bytes')
+
+    def __init__(self, method, route):
+        """Initialize RouteMetrics instance.
+
+        :param method: Route HTTP method
+        :param route: Route path
+
+        """
+        # Indexed by status // 100, index 0 is never used
+        self.latency = (None, ) + tuple(REQUEST_LATENCY.labels(method, route, status) for status in STATUS_CLASSES)
+        self.requests = (None, ) + tuple(REQUESTS.labels(method, route, status) for status in STATUS_CLASSES)
+        self.in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        self.request_bytes = REQUEST_BYTES.labels(method, route)
+        self.response_bytes = RESPONSE_BYTES.labels(method, route)
+
+
+#: Metrics of unresolved requests: redirects, 404 and 405
+SYSTEM_ROUTE_METRICS = RouteMetrics('*', 'unresolved')
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    """Record request latency, status class, in-flight requests and bytes per route."""
+    metrics = request.app.route_metrics.get(request.match_info.route, SYSTEM_ROUTE_METRICS)
+    metrics.in_flight.value += 1
+    started = time.perf_counter()
+    status = 500
+
+    try:
+        response = await handler(request)
+        status = response.status
+        metrics.response_bytes.value += response.content_length or 0
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        status_class = min(max(status // 100, 1), 5)
+        metrics.latency[status_class].observe(time.perf_counter() - started)
+        metrics.requests[status_class].value += 1
+        metrics.request_bytes.value += request.content_length or 0
+        metrics.in_flight.value -= 1
+
+
+def collect_app(app):
+    """Build metrics of app caches, requests coalescing, credential service and token writes."""
+    cache = Counter('http_response_cache_events_total', 'Response cache hits, misses and evictions.', ('event', ))
+    for event, count in app.response_cache.stats().items():
+        cache.labels(event).inc(count)
+
+    coalescing = Counter(
+        'http_coalesced_requests_total', 'Executed and coalesced identical requests.', ('result', )
+    )
+    coalescing.labels('executed').inc(app.request_coalescer.executed)
+    coalescing.labels('coalesced').inc(app.request_coalescer.coalesced)
+
+    credentials = Gauge('credentials_pending', 'Password hashing calls in executor or waiting for it.')
+    credentials.labels().set(app.credentials.pending)
+    rejected = Counter('credentials_rejected_total', 'Password hashing calls rejected by saturated executor.')
+    rejected.labels().inc(app.credentials.rejected)
+
+    token_writes = Counter(
+        'token_writes_total', 'Login token assignments and UPDATE batches they were written with.', ('kind', )
+    )
+    token_writes.labels('items').inc(app.token_writer.written)
+    token_writes.labels('batches').inc(app.token_writer.batches)
+
+    return cache, coalescing, credentials, rejected, token_writes
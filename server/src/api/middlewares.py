@@ -1,20 +1,26 @@
 """Public API middlewares."""
 
 from aiohttp import web
+from multidict import CIMultiDict
 
-from db import db_manager
-from db.models import User
-from .constants import Errors, UnauthorizedEndpoints
+from .constants import Errors
 from .helpers import Error
 from .exceptions import ApiException
+from .policies import get_policy
 
 
 __all__ = (
     'error_middleware',
-    'auth_middleware'
+    'policy_middleware',
+    'auth_middleware',
+    'cache_middleware',
+    'coalesce_middleware'
 )
 
 
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD'))
+
+
 @web.middleware
 async def error_middleware(request, handler):
     """Handle errors."""
@@ -34,33 +40,118 @@ async def error_middleware(request, handler):
         raise Errors.UNKNOWN_SERVER_ERROR.get_exception()
 
 
-async def auth_middleware(app, handler):
-    """Authenticate users."""
-    @web.middleware
-    async def middleware_handler(request):
-        """Check requests cookies and validate token."""
-        cookies = request.cookies
+def _request_too_large(max_body_size, actual_size):
+    """Build request body size limit exception."""
+    return Errors.REQUEST_TOO_LARGE.get_exception(
+        exception_params={'max_size': max_body_size, 'actual_size': actual_size},
+        max_size=max_body_size
+    )
+
+
+@web.middleware
+async def policy_middleware(request, handler):
+    """Enforce route request body size limit.
+
+    Declared Content-Length is checked at once. Chunked bodies are checked while
+    they are read, aiohttp rejects body reaching client max size.
+
+    """
+    max_body_size = get_policy(request).max_body_size
+    if max_body_size is None:
+        return await handler(request)
+
+    if (request.content_length or 0) > max_body_size:
+        raise _request_too_large(max_body_size, request.content_length)
+
+    # aiohttp 3.5 does not allow to pass client max size to request clone
+    request._client_max_size = max_body_size + 1
+    try:
+        return await handler(request)
+    except web.HTTPRequestEntityTooLarge:
+        raise _request_too_large(max_body_size, None)
+
+
+@web.middleware
+async def auth_middleware(request, handler):
+    """Authenticate users by token cookie."""
+    if not get_policy(request).auth:
+        return await handler(request)
+
+    token = request.cookies.get('token')
+    if not token:
+        return web.HTTPUnauthorized()
+
+    try:
+        user = await request.app.authenticator.authenticate(request.app, token)
+    except Exception:
+        return web.HTTPUnauthorized()
+
+    if not user:
+        return web.HTTPUnauthorized()
+
+    request['user'] = user
+    return await handler(request)
+
+
+@web.middleware
+async def cache_middleware(request, handler):
+    """Serve cacheable GET routes from response cache."""
+    policy = get_policy(request)
+    if not policy.cacheable or request.method != 'GET':
+        return await handler(request)
+
+    cache = request.app.response_cache
+    key = cache.key(request, policy)
+
+    response = await cache.get(key)
+    if response is None:
+        response = await handler(request)
+        await cache.set(key, response, policy.cache_ttl)
+
+    return response
+
+
+def _snapshot(response):
+    """Copy complete response parts that can be shared between requests."""
+    if isinstance(response, web.HTTPException) or response.prepared or not isinstance(response.body, bytes):
+        return None
+
+    return response.status, CIMultiDict(response.headers), response.body
+
+
+@web.middleware
+async def coalesce_middleware(request, handler):
+    """Run one handler call for identical concurrent idempotent requests."""
+    policy = get_policy(request)
+    if not policy.coalesce or request.method not in IDEMPOTENT_METHODS:
+        return await handler(request)
+
+    # Authenticated responses may differ per user, so they are shared only between requests of one user
+    principal = None
+    if policy.auth and 'user' in request:
+        principal = request['user']['id']
 
-        authorization_required = True
-        for endpoint in UnauthorizedEndpoints.ROUTES:
-            if request.path.endswith(endpoint):
-                authorization_required = False
-                break
+    key = (request.method, request.path, tuple(sorted(request.query.items())), principal)
 
-        if authorization_required and not cookies:
-            return web.HTTPUnauthorized()
+    async def execute():
+        """Call handler and snapshot response before other middlewares change it."""
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            response = e
 
-        if authorization_required:
-            try:
-                with db_manager.master_session() as db:
-                    user = db.query(User).filter(User.token == cookies['token']).first()
-            except Exception:
-                return web.HTTPUnauthorized()
+        return request, response, _snapshot(response)
 
-            if not user:
-                return web.HTTPUnauthorized()
+    leader, response, snapshot = await request.app.request_coalescer.do(key, execute)
+
+    if leader is request:
+        if isinstance(response, web.HTTPException):
+            raise response
+        return response
 
-            request.app.user = user
+    # Streamed responses and errors can't be shared, handle request separately
+    if snapshot is None:
         return await handler(request)
 
-    return middleware_handler
+    status, headers, body = snapshot
+    return web.Response(status=status, headers=headers, body=body)
@@ -0,0 +1,169 @@
+"""Public API keyset pagination module."""
+
+import base64
+
+import ujson
+from sqlalchemy import Integer, bindparam, select, tuple_
+
+from db.queries import Query
+from .constants import Errors, Status
+from .helpers import json_response
+
+
+__all__ = (
+    'KeysetList',
+    'encode_cursor',
+    'decode_cursor',
+)
+
+
+def encode_cursor(sort, key):
+    """Encode sort and last row key into opaque cursor."""
+    return base64.urlsafe_b64encode(ujson.dumps([sort, key]).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode cursor into (sort, last row key) pair or raise WRONG_PARAMETER_VALUE."""
+    try:
+        sort, key = ujson.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='cursor')
+
+    if not isinstance(key, list):
+        raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='cursor')
+
+    return sort, key
+
+
+class KeysetList:
+    """List of model rows paginated by (sort key, id) seek instead of OFFSET.
+
+    Query parameters: limit, cursor, fields (comma separated projection),
+    sort (sort key name, - prefix for descending order) and equality filters.
+    Compiled queries are kept per shape, i.e. per projection, filters, sort and
+    cursor presence, so every page costs one index range scan on a replica.
+
+    """
+
+    __slots__ = ('_table', '_fields', '_filters', '_sorts', '_default_limit', '_max_limit', '_queries')
+
+    def __init__(self, model, fields, filters=(), sorts=('id', ), default_limit=20, max_limit=100):
+        """Initialize KeysetList instance.
+
+        :param model: Listed model
+        :param fields: Fields available for projection
+        :param filters: Fields available for equality filters
+        :param sorts: Fields available for sorting. Rows with equal sort key are ordered by id
+        :param default_limit: Page size if limit is not requested
+        :param max_limit: Maximum page size
+
+        """
+        self._table = model.__table__
+        self._fields = tuple(fields)
+        self._filters = tuple(filters)
+        self._sorts = tuple(sorts)
+        self._default_limit = default_limit
+        self._max_limit = max_limit
+        self._queries = {}
+
+    def _query(self, fields, filters, sort, descending, after):
+        """Return compiled query of given shape."""
+        shape = (fields, filters, sort, descending, after)
+        query = self._queries.get(shape)
+        if query is not None:
+            return query
+
+        table = self._table
+        statement = select([table.c[name] for name in fields])
+
+        for name in filters:
+            statement = statement.where(table.c[name] == bindparam(f'filter_{name}', type_=table.c[name].type))
+
+        order = [table.c.id]
+        after_key = [bindparam('after_id', type_=Integer)]
+        if sort != 'id':
+            order.insert(0, table.c[sort])
+            after_key.insert(0, bindparam('after_key', type_=table.c[sort].type))
+
+        if after:
+            if descending:
+                statement = statement.where(tuple_(*order) < tuple_(*after_key))
+            else:
+                statement = statement.where(tuple_(*order) > tuple_(*after_key))
+
+        statement = statement.order_by(*[column.desc() if descending else column for column in order])
+        statement = statement.limit(bindparam('limit', type_=Integer))
+
+        query = self._queries[shape] = Query(statement)
+        return query
+
+    def _parse(self, request):
+        """Parse request query into query shape and values."""
+        params = request.query
+
+        try:
+            limit = int(params.get('limit', self._default_limit))
+        except ValueError:
+            raise Errors.WRONG_PARAMETER_TYPE.get_exception(param='limit', p_type='integer')
+        if not 0 < limit <= self._max_limit:
+            raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='limit')
+
+        sort = params.get('sort', 'id')
+        descending = sort.startswith('-')
+        if descending:
+            sort = sort[1:]
+        if sort not in self._sorts:
+            raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='sort')
+
+        fields = self._fields
+        if 'fields' in params:
+            fields = tuple(name for name in self._fields if name in params['fields'].split(','))
+            if not fields:
+                raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='fields')
+        # Cursor is built from sort key and id of the last row
+        fields = tuple(dict.fromkeys(fields + ('id', sort)))
+
+        values = {'limit': limit + 1}
+        filters = []
+        for name in self._filters:
+            if name in params:
+                try:
+                    values[f'filter_{name}'] = int(params[name])
+                except ValueError:
+                    raise Errors.WRONG_PARAMETER_TYPE.get_exception(param=name, p_type='integer')
+                filters.append(name)
+
+        after = 'cursor' in params
+        if after:
+            cursor_sort, key = decode_cursor(params['cursor'])
+            # Key values are passed as query parameters, so their types should match columns ones
+            if (cursor_sort != params.get('sort', 'id') or len(key) != (1 if sort == 'id' else 2)
+                    or type(key[-1]) is not int
+                    or (sort != 'id' and type(key[0]) is not self._table.c[sort].type.python_type)):
+                raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='cursor')
+            values['after_id'] = key[-1]
+            if sort != 'id':
+                values['after_key'] = key[0]
+
+        return (fields, tuple(filters), sort, descending, after), values, limit
+
+    async def respond(self, request):
+        """Return page of rows and next page cursor."""
+        shape, values, limit = self._parse(request)
+        _, _, sort, descending, _ = shape
+
+        async with request.app.db_replicas.acquire() as connection:
+            rows = await self._query(*shape).fetch(connection, **values)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            key = [last['id']] if sort == 'id' else [last[sort], last['id']]
+            next_cursor = encode_cursor(('-' if descending else '') + sort, key)
+
+        return json_response(data={
+            'status': Status.OK,
+            'items': [dict(row) for row in rows],
+            'next_cursor': next_cursor
+        })
@@ -0,0 +1,58 @@
+"""Public API routes policies module."""
+
+from commons.helpers import Constants
+from .cache import CacheScope
+
+
+__all__ = (
+    'RateLimit',
+    'RoutePolicy',
+    'SYSTEM_ROUTE_POLICY',
+    'get_policy',
+)
+
+
+class RateLimit(Constants):
+    """Route rate limit classes."""
+
+    DEFAULT = 'default'
+    AUTH = 'auth'
+
+
+class RoutePolicy:
+    """Declarative route metadata consumed by middlewares."""
+
+    __slots__ = ('auth', 'cacheable', 'cache_ttl', 'cache_scope', 'coalesce', 'rate_limit', 'max_body_size')
+
+    def __init__(self, auth=True, cacheable=False, cache_ttl=None, cache_scope=None, coalesce=True,
+                 rate_limit=RateLimit.DEFAULT, max_body_size=None):
+        """Initialize RoutePolicy instance.
+
+        :param auth: Authorization required
+        :param cacheable: Response can be cached
+        :param cache_ttl: Cached response time to live in seconds. Default: settings.cache.ttl
+        :param cache_scope: Cached response shared between all users or cached per principal.
+            Default: per principal for authorized routes, shared otherwise
+        :param coalesce: Identical concurrent GET/HEAD requests share one handler call
+        :param rate_limit: Rate limit class
+        :param max_body_size: Maximum request body size in bytes
+
+        """
+        self.auth = auth
+        self.cacheable = cacheable
+        self.cache_ttl = cache_ttl
+        if cache_scope is None:
+            cache_scope = CacheScope.PRINCIPAL if auth else CacheScope.PUBLIC
+        self.cache_scope = cache_scope
+        self.coalesce = coalesce
+        self.rate_limit = rate_limit
+        self.max_body_size = max_body_size
+
+
+#: Policy of unresolved requests. Router answers them with 404/405, no need to authorize
+SYSTEM_ROUTE_POLICY = RoutePolicy(auth=False)
+
+
+def get_policy(request):
+    """Return policy of resolved request route."""
+    return request.app.route_policies.get(request.match_info.route, SYSTEM_ROUTE_POLICY)
@@ -3,5 +3,8 @@
 from invoke import Collection
 
 from api.tasks.runserver import runserver
+from api.tasks.load import load, stub
 
 ns = Collection('api', runserver)
+ns.add_task(load)
+ns.add_task(stub)
@@ -0,0 +1,68 @@
+"""Generate API load task."""
+
+import asyncio
+
+import ujson
+import uvloop
+from aiohttp import web
+from invoke import task
+
+from api.loadgen import LoadMode, SCENARIOS, run_load, create_stub_upstream
+from config import settings
+
+
+@task(
+    help={
+        'url': f'API base url. Default: http://127.0.0.1:{settings.api.port}',
+        'scenario': f'One of: {", ".join(SCENARIOS)}. Default: ping',
+        'mode': 'open - fixed arrival rate, closed - fixed number of clients. Default: open',
+        'rate': 'Target scenario iterations per second, 0 for unpaced closed loop. Default: 100.0',
+        'duration': 'Load duration in seconds. Default: 10.0',
+        'concurrency': 'Maximum concurrent iterations and connections. Default: 64',
+        'output': 'Save results to JSON file',
+    }
+)
+def load(ctx, url=None, scenario='ping', mode=LoadMode.OPEN, rate=100.0, duration=10.0, concurrency=64, output=None):
+    """Generate load on API server and report latency percentiles."""
+    if scenario not in SCENARIOS:
+        print(f'Wrong scenario: {scenario}. Available scenarios: {", ".join(SCENARIOS)}')
+        return
+
+    if mode not in LoadMode.ALL:
+        print(f'Wrong mode: {mode}. Available modes: {", ".join(LoadMode.ALL)}')
+        return
+
+    if mode == LoadMode.OPEN and rate <= 0:
+        print('Open loop mode requires positive rate')
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    loop = asyncio.get_event_loop()
+
+    result = loop.run_until_complete(run_load(
+        url or f'http://127.0.0.1:{settings.api.port}',
+        scenario,
+        mode=mode,
+        rate=float(rate),
+        duration=float(duration),
+        concurrency=int(concurrency),
+        loop=loop
+    ))
+    report = dict(result.to_dict(), scenario=scenario, mode=mode, rate=rate, concurrency=concurrency)
+
+    print(ujson.dumps(report, indent=2))
+
+    if output:
+        with open(output, 'w') as f:
+            f.write(ujson.dumps(report, indent=2))
+
+
+@task(
+    help={
+        'bind': 'Bind to custom address or/and port. Default: 127.0.0.1:8081',
+    }
+)
+def stub(ctx, bind='127.0.0.1:8081'):
+    """Start local upstream stand-in. Point settings check.url to its /api/v1/ping/."""
+    host, port = bind.split(':')
+    web.run_app(create_stub_upstream(), host=host, port=int(port))
@@ -0,0 +1,16 @@
+"""Public API ARTICLES module."""
+
+from api.pagination import KeysetList
+from db.models import Article
+
+
+ARTICLES = KeysetList(
+    Article,
+    fields=('id', 'title', 'content', 'category_id', 'user_id'),
+    filters=('user_id', 'category_id')
+)
+
+
+async def articles(request):
+    """List articles page by page."""
+    return await ARTICLES.respond(request)
@@ -3,12 +3,55 @@
 import asyncio
 
 from aiohttp import web
-from sqlalchemy import select, update
+from sqlalchemy import Integer, String, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from db.models import User
+from db.queries import Query
 from api.helpers import json_response
-from api.constants import Status
-from commons.helpers import generate_token, get_password
+from api.constants import Errors, Status
+from commons.credentials import CredentialsBusy
+from commons.helpers import generate_token
+
+
+USER_BY_LOGIN = Query(
+    select(['*']).select_from(User).where(User.login == bindparam('login'))
+)
+
+UPDATE_USER_TOKENS = Query(
+    text(
+        'UPDATE "user" SET token = batch.token, password = coalesce(batch.password, "user".password) '
+        'FROM unnest(CAST(:user_ids AS INTEGER[]), CAST(:tokens AS VARCHAR[]), CAST(:passwords AS VARCHAR[])) '
+        'AS batch (id, token, password) '
+        'WHERE "user".id = batch.id'
+    ).bindparams(
+        bindparam('user_ids', type_=ARRAY(Integer)),
+        bindparam('tokens', type_=ARRAY(String)),
+        bindparam('passwords', type_=ARRAY(String)),
+    )
+)
+
+
+async def write_tokens(app, items):
+    """Assign tokens and rehashed passwords of login batch with one UPDATE.
+
+    :param app: Server app
+    :param items: (user id, token, new password or None) list
+
+    """
+    # The last login of a user wins, like with sequential updates
+    latest = {}
+    for user_id, token, password in items:
+        previous = latest.get(user_id)
+        latest[user_id] = (token, password or (previous[1] if previous else None))
+
+    async with app.db.acquire() as connection:
+        await UPDATE_USER_TOKENS.execute(
+            connection,
+            user_ids=list(latest),
+            tokens=[token for token, _ in latest.values()],
+            passwords=[password for _, password in latest.values()]
+        )
 
 
 async def auth(request):
@@ -22,22 +65,26 @@ async def auth(request):
         return web.HTTPBadRequest()
 
     async with request.app.db.acquire() as connection:
-        user_query = select(['*']).select_from(User).where(
-            User.login == login
-        ).where(User.password == get_password(password))
+        user = await asyncio.wait_for(USER_BY_LOGIN.fetchrow(connection, login=login), timeout=None)
 
-        user = await asyncio.wait_for(connection.fetchrow(user_query), timeout=None)
+    # Connection is not held while password is hashed. Unknown login is hashed too not to answer faster
+    try:
+        valid, new_password = await request.app.credentials.verify(password, user['password'] if user else None)
+    except CredentialsBusy:
+        raise Errors.CREDENTIALS_BUSY.get_exception(exception_params={'headers': {'Retry-After': '1'}})
 
-        if not user:
-            return json_response(data={'status': Status.ERROR, 'message': 'User not found!'})
+    if not user or not valid:
+        return json_response(data={'status': Status.ERROR, 'message': 'User not found!'})
 
-        token = generate_token(user['id'])
+    authenticator = request.app.authenticator
+    token = generate_token(user['id'], **authenticator.token_claims(user))
 
-        await connection.execute(
-            update(User).where(User.id == user['id']).values(
-                token=token
-            )
-        )
+    # Concurrent logins are written together, the handler waits for its batch
+    await request.app.token_writer.write((user['id'], token, new_password))
+
+    if user['token']:
+        authenticator.forget(user['token'])
+    authenticator.remember(token, user)
 
     response = web.json_response({
         'status': Status.OK
@@ -0,0 +1,16 @@
+"""Public API CATEGORIES module."""
+
+from api.pagination import KeysetList
+from db.models import Category
+
+
+CATEGORIES = KeysetList(
+    Category,
+    fields=('id', 'title'),
+    sorts=('id', 'title')
+)
+
+
+async def categories(request):
+    """List categories page by page."""
+    return await CATEGORIES.respond(request)
@@ -1,22 +1,55 @@
-"""Public API PING module."""
+"""Public API CHECK module."""
+
+import time
+
 import ujson
+from aiohttp import ClientTimeout
+
 from api.helpers import json_response
 from api.constants import Status
-from aiohttp import ClientSession, TCPConnector
+from commons.singleflight import SingleFlight
 
 
+class UpstreamProbe:
+    """Upstream liveness probe.
 
-async def check(request):
-    """Check the API is alive."""
+    Result is cached for ttl seconds and concurrent callers share one in-flight probe.
+
+    """
+
+    __slots__ = ('_session', '_url', '_ttl', '_timeout', '_result', '_expires_at', '_flight')
+
+    def __init__(self, session, url, ttl, timeout):
+        """Initialize UpstreamProbe instance.
+
+        :param session: App scoped client session
+        :param url: Upstream ping url
+        :param ttl: Probe result time to live in seconds
+        :param timeout: Probe timeout in seconds
 
-    status = 'fail'
-    response_status = 200
+        """
+        self._session = session
+        self._url = url
+        self._ttl = ttl
+        self._timeout = ClientTimeout(total=timeout)
+        self._result = None
+        self._expires_at = 0
+        self._flight = SingleFlight()
 
-    try:
-        async with ClientSession(
-                connector=TCPConnector(verify_ssl=False), raise_for_status=True
-        ) as session:
-            async with session.get('https://subchat.site/api/v1/ping/') as response:
+    async def __call__(self):
+        """Return (response status, upstream status) pair."""
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+
+        return await self._flight.do(self._url, self._probe)
+
+    async def _probe(self):
+        """Request upstream and cache result."""
+        status = 'fail'
+        response_status = 200
+
+        try:
+            async with self._session.get(self._url, timeout=self._timeout) as response:
                 data = await response.read()
                 data = ujson.loads(data.decode('utf-8'))
 
@@ -24,7 +57,17 @@ async def check(request):
                     status = 'alive'
 
                 response_status = response.status
-    except Exception as e:
-        status = 'error'
+        except Exception:
+            status = 'error'
+
+        self._result = (response_status, status)
+        self._expires_at = time.monotonic() + self._ttl
+
+        return self._result
+
+
+async def check(request):
+    """Check the upstream API is alive."""
+    response_status, status = await request.app.upstream_probe()
 
     return json_response(status=response_status, data={'status': status})
@@ -0,0 +1,83 @@
+"""Public API EXPORT module."""
+
+import asyncio
+
+import structlog
+import ujson
+from aiohttp import web
+from sqlalchemy import select
+
+from config import settings
+from api.constants import ContentType, Status
+from db.models import Article, Category, User
+from db.queries import Query
+
+
+logger = structlog.getLogger('api.' + __name__)
+
+#: Last line of export which failed after response headers were sent
+EXPORT_FAILED = ujson.dumps({'status': Status.ERROR, 'message': 'Export failed, data is incomplete'}) + '\n'
+
+EXPORT_ARTICLES = Query(
+    select([
+        Article.id,
+        Article.title,
+        Article.content,
+        Article.category_id,
+        Category.title.label('category_title'),
+        Article.user_id,
+        User.login.label('user_login'),
+        User.first_name.label('user_first_name'),
+        User.last_name.label('user_last_name'),
+    ]).select_from(
+        Article.__table__.join(Category.__table__).join(User.__table__)
+    ).order_by(Article.id)
+)
+
+
+async def export_articles(request):
+    """Stream all articles with their authors and categories as NDJSON.
+
+    Rows are read through a server-side cursor and written in small chunks.
+    Every write waits for the transport to drain, so a slow client slows the
+    cursor down instead of growing worker memory. Once streaming started, an
+    error can't change response status, so the stream ends with an error record.
+
+    """
+    response = web.StreamResponse(headers={'Content-Type': ContentType.NDJSON})
+    response.enable_chunked_encoding()
+
+    prefetch = settings.export.prefetch
+    chunk_size = settings.export.chunk_size
+
+    try:
+        async with request.app.db.acquire() as connection:
+            # Consistent snapshot of all three tables for the whole export
+            async with connection.transaction(isolation='repeatable_read', readonly=True):
+                await response.prepare(request)
+
+                lines = []
+                async for row in EXPORT_ARTICLES.cursor(connection, prefetch=prefetch):
+                    lines.append(ujson.dumps(dict(row)))
+
+                    if len(lines) >= chunk_size:
+                        lines.append('')
+                        await response.write('\n'.join(lines).encode('utf-8'))
+                        lines = []
+
+                if lines:
+                    lines.append('')
+                    await response.write('\n'.join(lines).encode('utf-8'))
+    except (asyncio.CancelledError, ConnectionError):
+        raise
+    except Exception:
+        if not response.prepared:
+            raise
+
+        logger.exception('Articles export failed')
+        await response.write(EXPORT_FAILED.encode('utf-8'))
+        response.force_close()
+
+    await response.write_eof()
+
+    return response
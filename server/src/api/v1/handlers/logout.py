@@ -0,0 +1,30 @@
+"""Logout API handler module."""
+
+from sqlalchemy import bindparam, update
+
+from db.models import User
+from db.queries import Query
+from api.helpers import json_response
+from api.constants import Status
+
+
+CLEAR_USER_TOKEN = Query(
+    update(User).where(User.id == bindparam('user_id')).values(token=None)
+)
+
+
+async def logout(request):
+    """Revoke current user tokens."""
+    user_id = request['user']['id']
+
+    async with request.app.db.acquire() as connection:
+        async with connection.transaction():
+            await CLEAR_USER_TOKEN.execute(connection, user_id=user_id)
+            await request.app.authenticator.revoke(connection, user_id)
+
+    request.app.authenticator.forget(request.cookies['token'])
+
+    response = json_response(data={'status': Status.OK})
+    response.del_cookie('token')
+
+    return response
@@ -0,0 +1,13 @@
+"""Metrics API handler module."""
+
+from aiohttp import web
+
+from commons.metrics import REGISTRY
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+async def metrics(request):
+    """Expose metrics in Prometheus text format."""
+    return web.Response(body=REGISTRY.render().encode('utf-8'), headers={'Content-Type': CONTENT_TYPE})
@@ -0,0 +1,37 @@
+"""Public API PROFILE module."""
+
+import hmac
+
+from aiohttp import web
+
+from config import settings
+from api.constants import Errors, Headers
+from commons.profiler import ProfilerBusy
+
+
+async def profile(request):
+    """Sample worker threads stacks for ?seconds=N and return them collapsed.
+
+    Available only with X-Admin-Token header equal to settings.profiler.admin_token.
+
+    """
+    admin_token = settings.profiler.admin_token
+    token = request.headers.get(Headers.ADMIN_TOKEN, '')
+    if not admin_token or not hmac.compare_digest(token.encode('utf-8'), str(admin_token).encode('utf-8')):
+        raise Errors.ADMIN_TOKEN_REQUIRED.get_exception()
+
+    try:
+        duration = float(request.query.get('seconds', settings.profiler.duration))
+    except ValueError:
+        raise Errors.WRONG_PARAMETER_TYPE.get_exception(param='seconds', p_type='number')
+
+    duration = min(max(duration, 0), settings.profiler.max_duration)
+
+    try:
+        stacks = await request.app.profiler.profile(duration)
+    except ProfilerBusy:
+        raise Errors.PROFILER_BUSY.get_exception()
+
+    body = ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+    return web.Response(text=body, content_type='text/plain')
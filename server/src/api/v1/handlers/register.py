@@ -1,37 +1,163 @@
 import asyncio
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+import ujson
+from sqlalchemy import String, any_, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from api.helpers import json_response
-from api.constants import Status
-from commons.helpers import get_password
+from api.constants import BulkStatus, ContentType, Errors, Status
+from commons.credentials import CredentialsBusy
 from db.models import User
+from db.queries import Query
+
+
+REQUIRED_PARAMETERS = ('first_name', 'last_name', 'login', 'password')
+
+USER_BY_LOGIN = Query(
+    select(['*']).select_from(User).where(User.login == bindparam('login'))
+)
+
+INSERT_USER = Query(
+    insert(User).values({
+        field: bindparam(field) for field in REQUIRED_PARAMETERS
+    }).on_conflict_do_nothing().returning(User.id)
+)
 
 
 async def register(request):
     data = await request.json()
-    required_parameters = ['first_name', 'last_name', 'login', 'password']
 
-    for field in required_parameters:
+    for field in REQUIRED_PARAMETERS:
         if field not in data:
             raise KeyError()
 
-    data['password'] = get_password(data['password'])
+    async with request.app.db_replicas.acquire() as connection:
+        user = await asyncio.wait_for(USER_BY_LOGIN.fetchrow(connection, login=data['login']), timeout=None)
+
+    if user:
+        return json_response(data={'status': Status.OK, 'user_id': user['id']})
+
+    try:
+        data['password'] = await request.app.credentials.hash(data['password'])
+    except CredentialsBusy:
+        raise Errors.CREDENTIALS_BUSY.get_exception(exception_params={'headers': {'Retry-After': '1'}})
 
     async with request.app.db.acquire() as connection:
-        query = select(['*']).select_from(User).where(
-            User.login == data['login']
+        user_id = await asyncio.shield(INSERT_USER.fetchval(
+            connection, **{field: data[field] for field in REQUIRED_PARAMETERS}
+        ))
+
+        # Registered concurrently or not replicated yet
+        if user_id is None:
+            user = await USER_BY_LOGIN.fetchrow(connection, login=data['login'])
+            user_id = user['id']
+
+    return json_response(data={'status': Status.OK, 'user_id': user_id})
+
+
+BULK_MAX_USERS = 1000
+
+USERS_BY_LOGINS = Query(
+    select([User.id, User.login]).where(User.login == any_(bindparam('logins', type_=ARRAY(String))))
+)
+
+CREATE_USER_IMPORT = Query(text(
+    'CREATE TEMPORARY TABLE user_import '
+    '(position INTEGER, login VARCHAR, password VARCHAR, first_name VARCHAR, last_name VARCHAR) '
+    'ON COMMIT DROP'
+))
+
+USER_IMPORT_COLUMNS = ('position', 'login', 'password', 'first_name', 'last_name')
+
+INSERT_IMPORTED_USERS = Query(text(
+    'INSERT INTO "user" (login, password, first_name, last_name) '
+    'SELECT login, password, first_name, last_name FROM user_import i '
+    'WHERE NOT EXISTS (SELECT 1 FROM "user" u WHERE u.login = i.login) '
+    'ORDER BY position '
+    'ON CONFLICT DO NOTHING '
+    'RETURNING id, login'
+))
+
+
+async def _read_users(request):
+    """Read users from JSON array or NDJSON body."""
+    if request.content_type == ContentType.NDJSON:
+        body = await request.text()
+        try:
+            return [ujson.loads(line) for line in body.splitlines() if line.strip()]
+        except ValueError:
+            raise Errors.UNPROCESSABLE_ENTITY.get_exception()
+
+    try:
+        users = await request.json(loads=ujson.loads)
+    except ValueError:
+        raise Errors.UNPROCESSABLE_ENTITY.get_exception()
+
+    if not isinstance(users, list):
+        raise Errors.WRONG_JSON_STRUCTURE.get_exception(errors='Array of users expected')
+
+    return users
+
+
+def _is_valid(user):
+    """Check user has all required string parameters."""
+    return isinstance(user, dict) and all(isinstance(user.get(field), str) for field in REQUIRED_PARAMETERS)
+
+
+async def bulk_register(request):
+    """Register users from JSON array or NDJSON stream.
+
+    Every item gets status created, conflict (login is taken, user_id is of the existing user) or invalid.
+
+    """
+    users = await _read_users(request)
+    if len(users) > BULK_MAX_USERS:
+        raise Errors.WRONG_JSON_STRUCTURE.get_exception(errors=f'At most {BULK_MAX_USERS} users expected')
+
+    logins = list({user['login'] for user in users if _is_valid(user)})
+
+    async with request.app.db.acquire() as connection:
+        existing = {row['login']: row['id'] for row in await USERS_BY_LOGINS.fetch(connection, logins=logins)}
+
+    # First occurrence of every new login is created, the rest are conflicts
+    new_users = {}
+    for position, user in enumerate(users):
+        if _is_valid(user) and user['login'] not in existing and user['login'] not in new_users:
+            new_users[user['login']] = position
+
+    # Only new users passwords are hashed
+    try:
+        passwords = await request.app.credentials.hash_many(
+            [users[position]['password'] for position in new_users.values()]
         )
-        user = await asyncio.wait_for(connection.fetchrow(query), timeout=None)
+    except CredentialsBusy:
+        raise Errors.CREDENTIALS_BUSY.get_exception(exception_params={'headers': {'Retry-After': '1'}})
 
-        if not user:
-            insert_q = insert(
-                User,
-                data
-            ).on_conflict_do_nothing().returning(User.id)
+    created = {}
+    if new_users:
+        records = [
+            (position, login, password, users[position]['first_name'], users[position]['last_name'])
+            for (login, position), password in zip(new_users.items(), passwords)
+        ]
 
-            user_id = await asyncio.shield(connection.fetchval(insert_q))
-        else:
-            user_id = user['id']
+        async with request.app.db.acquire() as connection:
+            async with connection.transaction():
+                await CREATE_USER_IMPORT.execute(connection)
+                await connection.copy_records_to_table('user_import', records=records, columns=USER_IMPORT_COLUMNS)
+                created = {row['login']: row['id'] for row in await INSERT_IMPORTED_USERS.fetch(connection)}
 
+            # Registered concurrently
+            raced = [login for login in new_users if login not in created]
+            if raced:
+                rows = await USERS_BY_LOGINS.fetch(connection, logins=raced)
+                existing.update((row['login'], row['id']) for row in rows)
 
-    return json_response(data={'status': Status.OK, 'user_id': user_id})
+    results = []
+    for position, user in enumerate(users):
+        if not _is_valid(user):
+            results.append({'status': BulkStatus.INVALID, 'user_id': None})
+        elif new_users.get(user['login']) == position and user['login'] in created:
+            results.append({'status': BulkStatus.CREATED, 'user_id': created[user['login']]})
+        else:
+            user_id = created.get(user['login']) or existing.get(user['login'])
+            results.append({'status': BulkStatus.CONFLICT, 'user_id': user_id})
+
+    return json_response(data={'status': Status.OK, 'users': results})
@@ -0,0 +1,92 @@
+"""Public API SEARCH module."""
+
+import re
+
+from sqlalchemy import Float, Integer, String, bindparam, text
+
+from api.constants import Errors, Status
+from api.helpers import json_response
+from api.pagination import encode_cursor, decode_cursor
+from db.queries import Query
+
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+SEARCH_SQL = (
+    'SELECT a.id, a.title, a.category_id, a.user_id, ts_rank_cd(a.search_vector, q.query)::float8 AS rank '
+    "FROM article a, to_tsquery('english', :query) AS q (query) "
+    'WHERE a.search_vector @@ q.query {after}'
+    'ORDER BY rank DESC, a.id DESC '
+    'LIMIT :limit'
+)
+
+SEARCH_AFTER_SQL = 'AND (ts_rank_cd(a.search_vector, q.query)::float8, a.id) < (:after_rank, :after_id) '
+
+SEARCH_PARAMS = (
+    bindparam('query', type_=String),
+    bindparam('limit', type_=Integer),
+)
+
+SEARCH_ARTICLES = Query(text(SEARCH_SQL.format(after='')).bindparams(*SEARCH_PARAMS))
+
+SEARCH_ARTICLES_AFTER = Query(text(SEARCH_SQL.format(after=SEARCH_AFTER_SQL)).bindparams(
+    *SEARCH_PARAMS,
+    bindparam('after_rank', type_=Float),
+    bindparam('after_id', type_=Integer)
+))
+
+WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def to_prefix_query(phrase):
+    """Convert user phrase into tsquery matching all words by prefix."""
+    return ' & '.join(f'{word}:*' for word in WORD.findall(phrase))
+
+
+async def search(request):
+    """Search articles by title and content words prefixes, best matches first.
+
+    Pages are sought by (rank, id) of the last row, see cursor in response.
+
+    """
+    params = request.query
+
+    query = to_prefix_query(params.get('q', ''))
+    if not query:
+        raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='q')
+
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise Errors.WRONG_PARAMETER_TYPE.get_exception(param='limit', p_type='integer')
+    if not 0 < limit <= MAX_LIMIT:
+        raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='limit')
+
+    values = {'query': query, 'limit': limit + 1}
+    statement = SEARCH_ARTICLES
+
+    if 'cursor' in params:
+        sort, key = decode_cursor(params['cursor'])
+        # Rank is kept as repr string, JSON float would lose precision and break seek
+        try:
+            if sort != 'rank' or len(key) != 2 or not isinstance(key[1], int):
+                raise ValueError()
+            values['after_rank'], values['after_id'] = float(key[0]), key[1]
+        except (ValueError, TypeError):
+            raise Errors.WRONG_PARAMETER_VALUE.get_exception(param='cursor')
+        statement = SEARCH_ARTICLES_AFTER
+
+    async with request.app.db_replicas.acquire() as connection:
+        rows = await statement.fetch(connection, **values)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor('rank', [repr(rows[-1]['rank']), rows[-1]['id']])
+
+    return json_response(data={
+        'status': Status.OK,
+        'items': [dict(row) for row in rows],
+        'next_cursor': next_cursor
+    })
@@ -0,0 +1,89 @@
+"""Write coalescing module."""
+
+import asyncio
+
+
+class BatchWriter:
+    """Collect items for max_delay seconds or up to max_size and write them with one call.
+
+    Callers wait until their batch is written, so write semantics do not change,
+    only the number of round trips does. Batches are written through
+    asyncio.shield, a cancelled caller does not cancel its batch.
+
+    """
+
+    __slots__ = ('_write', '_max_size', '_max_delay', '_items', '_timer', '_tasks', 'batches', 'written')
+
+    def __init__(self, write, max_size, max_delay):
+        """Initialize BatchWriter instance.
+
+        :param write: Coroutine function writing list of items
+        :param max_size: Maximum batch size
+        :param max_delay: Maximum delay of first batch item in seconds
+
+        """
+        self._write = write
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._items = []
+        self._timer = None
+        self._tasks = set()
+
+        self.batches = 0
+        self.written = 0
+
+    async def write(self, item):
+        """Add item to current batch and wait until the batch is written."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._items.append((item, future))
+
+        if len(self._items) >= self._max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self.flush)
+
+        return await asyncio.shield(future)
+
+    def flush(self):
+        """Start writing current batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        items, self._items = self._items, []
+        if not items:
+            return
+
+        task = asyncio.ensure_future(self._run(items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items):
+        """Write batch and resolve its callers."""
+        try:
+            await self._write([item for item, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark exception as retrieved when caller was cancelled
+                    future.exception()
+            return
+
+        self.batches += 1
+        self.written += len(items)
+
+        for _, future in items:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self):
+        """Write pending items and wait for in-flight batches."""
+        self.flush()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+    def __len__(self):
+        """Return number of items waiting for flush."""
+        return len(self._items)
@@ -0,0 +1,72 @@
+"""In-process caches module."""
+
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU mapping which entries expire after ttl seconds."""
+
+    __slots__ = ('_data', '_maxsize', '_ttl', '_timer', 'hits', 'misses', 'evictions')
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        """Initialize TTLCache instance.
+
+        :param maxsize: Maximum number of stored entries
+        :param ttl: Default entry time to live in seconds
+        :param timer: Monotonic clock function
+
+        """
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return cached value and mark it as recently used."""
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store value evicting least recently used entries above maxsize."""
+        data = self._data
+        data[key] = (value, self._timer() + (self._ttl if ttl is None else ttl))
+        data.move_to_end(key)
+
+        while len(data) > self._maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove entry and return its value."""
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key):
+        """Check if non expired entry exists."""
+        item = self._data.get(key)
+        return item is not None and item[1] > self._timer()
+
+    def __len__(self):
+        """Return number of stored entries, including not yet purged expired ones."""
+        return len(self._data)
@@ -0,0 +1,246 @@
+"""Password hashing off the event loop module."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from commons.helpers import Constants, get_password
+
+
+__all__ = (
+    'ExecutorKind',
+    'CredentialsBusy',
+    'SHA512Scheme',
+    'PBKDF2Scheme',
+    'PasswordHasher',
+    'CredentialService',
+    'create_password_hasher',
+)
+
+
+class ExecutorKind(Constants):
+    """Credential service executor kinds."""
+
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+class CredentialsBusy(Exception):
+    """Exception to handle saturated credential service."""
+
+
+class SHA512Scheme:
+    """Legacy salted SHA-512 hex digest, stored without scheme prefix."""
+
+    __slots__ = ()
+
+    name = 'sha512'
+
+    def hash(self, password):
+        """Hash password."""
+        return get_password(password)
+
+    def identify(self, encoded):
+        """Check if password was hashed with this scheme."""
+        return '$' not in encoded
+
+    def verify(self, password, encoded):
+        """Check password against stored hash."""
+        return hmac.compare_digest(get_password(password), encoded)
+
+    def needs_update(self, encoded):
+        """Check if stored hash parameters are outdated."""
+        return False
+
+
+class PBKDF2Scheme:
+    """PBKDF2-HMAC-SHA256 with per password salt, stored as name$iterations$salt$digest."""
+
+    __slots__ = ('iterations', )
+
+    name = 'pbkdf2_sha256'
+
+    def __init__(self, iterations):
+        """Initialize PBKDF2Scheme instance.
+
+        :param iterations: Number of HMAC iterations
+
+        """
+        self.iterations = iterations
+
+    def _encode(self, password, salt, iterations):
+        """Hash password with given parameters."""
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), iterations)
+        return f'{self.name}${iterations}${salt}${base64.b64encode(digest).decode("ascii")}'
+
+    def hash(self, password):
+        """Hash password."""
+        return self._encode(password, secrets.token_hex(16), self.iterations)
+
+    def identify(self, encoded):
+        """Check if password was hashed with this scheme."""
+        return encoded.startswith(self.name + '$')
+
+    def verify(self, password, encoded):
+        """Check password against stored hash."""
+        try:
+            _, iterations, salt, _ = encoded.split('$', 3)
+            iterations = int(iterations)
+        except ValueError:
+            # Malformed hash matches no password
+            return False
+        return hmac.compare_digest(self._encode(password, salt, iterations), encoded)
+
+    def needs_update(self, encoded):
+        """Check if stored hash parameters are outdated."""
+        return int(encoded.split('$', 2)[1]) != self.iterations
+
+
+class PasswordHasher:
+    """Hash passwords with default scheme and verify hashes of any known scheme."""
+
+    __slots__ = ('_schemes', '_default', '_dummy')
+
+    def __init__(self, schemes, default):
+        """Initialize PasswordHasher instance.
+
+        :param schemes: Known schemes
+        :param default: Name of scheme new hashes are made with
+
+        """
+        self._schemes = tuple(schemes)
+        self._default = next(scheme for scheme in self._schemes if scheme.name == default)
+        # Unknown logins are checked against it to take as long as known ones
+        self._dummy = self._default.hash(secrets.token_hex(16))
+
+    def hash(self, password):
+        """Hash password with default scheme."""
+        return self._default.hash(password)
+
+    def hash_many(self, passwords):
+        """Hash passwords list with default scheme."""
+        return [self._default.hash(password) for password in passwords]
+
+    def verify(self, password, encoded):
+        """Check password and rehash it if stored hash is outdated.
+
+        :param password: Non encrypted password
+        :param encoded: Stored password hash or None if user does not exist
+        :return: (password is valid, new hash or None) pair
+
+        """
+        if encoded is None:
+            self._default.verify(password, self._dummy)
+            return False, None
+
+        scheme = next((scheme for scheme in self._schemes if scheme.identify(encoded)), None)
+        if scheme is None or not scheme.verify(password, encoded):
+            return False, None
+
+        if scheme is not self._default or scheme.needs_update(encoded):
+            return True, self._default.hash(password)
+
+        return True, None
+
+
+def create_password_hasher(config):
+    """Create password hasher from credentials settings."""
+    return PasswordHasher((PBKDF2Scheme(config.pbkdf2_iterations), SHA512Scheme()), config.scheme)
+
+
+class CredentialService:
+    """Run password hashing in executor with bounded number of pending calls.
+
+    Calls above workers + queue_size pending ones are rejected at once instead
+    of queueing, so login storms neither block the event loop nor pile up.
+
+    """
+
+    __slots__ = ('_hasher', '_executor', '_workers', '_limit', '_chunk_size', 'pending', 'rejected')
+
+    def __init__(self, hasher, executor=ExecutorKind.THREAD, workers=4, queue_size=64, chunk_size=32):
+        """Initialize CredentialService instance.
+
+        :param hasher: Password hasher
+        :param executor: Thread or process executor
+        :param workers: Number of executor workers
+        :param queue_size: Maximum calls waiting for a free worker
+        :param chunk_size: Maximum passwords hashed by one executor call of hash_many
+
+        """
+        executor_class = ProcessPoolExecutor if executor == ExecutorKind.PROCESS else ThreadPoolExecutor
+
+        self._hasher = hasher
+        self._executor = executor_class(max_workers=workers)
+        self._workers = workers
+        self._limit = workers + queue_size
+        self._chunk_size = chunk_size
+        self.pending = 0
+        self.rejected = 0
+
+    def _reserve(self, calls):
+        """Raise CredentialsBusy if calls do not fit into pending calls limit."""
+        if self.pending + calls > self._limit:
+            self.rejected += 1
+            raise CredentialsBusy('Too many pending credential checks')
+
+    async def _run(self, func, *args):
+        """Run func in executor or raise CredentialsBusy."""
+        self._reserve(1)
+
+        loop = asyncio.get_event_loop()
+
+        def release(_):
+            """Free slot when executor is done, even if caller was cancelled."""
+            loop.call_soon_threadsafe(self._release)
+
+        self.pending += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(release)
+
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release(self):
+        """Free pending call slot."""
+        self.pending -= 1
+
+    async def hash(self, password):
+        """Hash password with default scheme."""
+        return await self._run(self._hasher.hash, password)
+
+    async def hash_many(self, passwords):
+        """Hash passwords in small chunks keeping at most half of workers busy.
+
+        Every chunk takes a pending call slot when it is submitted, so single
+        checks interleave with bulk hashing and meet the same limit.
+
+        """
+        size = self._chunk_size
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        semaphore = asyncio.Semaphore(max(self._workers // 2, 1))
+
+        async def hash_chunk(chunk):
+            """Hash chunk when bulk hashing concurrency allows."""
+            async with semaphore:
+                return await self._run(self._hasher.hash_many, chunk)
+
+        tasks = [asyncio.ensure_future(hash_chunk(chunk)) for chunk in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return [encoded for chunk in results for encoded in chunk]
+
+    async def verify(self, password, encoded):
+        """Return (password is valid, new hash or None) pair."""
+        return await self._run(self._hasher.verify, password, encoded)
+
+    def shutdown(self):
+        """Stop executor workers."""
+        self._executor.shutdown(wait=False)
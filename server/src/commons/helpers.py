@@ -42,33 +42,34 @@ def get_password(password):
     return password_hash.hexdigest()
 
 
-def generate_token(user_id):
+def generate_token(user_id, **claims):
     """Generate authorization token. JWT encryption used.
 
     :param user_id: User identifier
     :type user_id: int
+    :param claims: Extra token claims
     :return: Encrypted authorization token
     :rtype: str
 
     """
     return jwt.encode(
-        {'user_id': user_id, 'created_at': int(time.time())},
+        {**claims, 'user_id': user_id, 'created_at': time.time()},
         settings.salt,
         algorithm='HS256'
     ).decode('utf-8')
 
 
 def encode_token(token):
-    """Encode authorization token. JWT decryption used.
+    """Decode and verify authorization token. JWT decryption used.
 
     :param token: Authorization token
-    :type token:
-    :return: Decrypted authorization token
+    :type token: str
+    :return: Decrypted authorization token claims
     :rtype: dict
+    :raises jwt.InvalidTokenError: If token signature is not valid
 
     """
-    return jwt.encode(token, settings.salt, algorithms=['HS256'])
-
+    return jwt.decode(token, settings.salt, algorithms=['HS256'])
 
 
 class Constants:
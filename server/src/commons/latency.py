@@ -0,0 +1,122 @@
+"""HDR style latency histogram module."""
+
+import math
+from collections import Counter
+
+
+__all__ = (
+    'LatencyHistogram',
+)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of microsecond latencies with bounded relative error.
+
+    Every power of two range is split into 2 ** (significant_bits - 1) equal
+    buckets, so recorded values are kept with relative error below
+    2 ** (1 - significant_bits) whatever their magnitude, like in HdrHistogram.
+
+    """
+
+    __slots__ = ('_bits', '_counts', 'count', 'min', 'max', 'sum')
+
+    PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+    def __init__(self, significant_bits=8):
+        """Initialize LatencyHistogram instance.
+
+        :param significant_bits: Bits of recorded values kept exactly
+
+        """
+        self._bits = significant_bits
+        self._counts = Counter()
+        self.count = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value):
+        """Return bucket index of value."""
+        magnitude = max(value.bit_length() - self._bits, 0)
+        return (magnitude << self._bits) + (value >> magnitude)
+
+    def _highest_equivalent(self, index):
+        """Return highest value of bucket."""
+        magnitude = index >> self._bits
+        sub_bucket = index & ((1 << self._bits) - 1)
+        return ((sub_bucket + 1) << magnitude) - 1
+
+    def record(self, seconds, count=1):
+        """Record latency.
+
+        :param seconds: Latency in seconds
+        :param count: Number of equal latencies
+
+        """
+        value = max(int(seconds * 1000000), 0)
+
+        self._counts[self._index(value)] += count
+        self.count += count
+        self.sum += value * count
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def record_corrected(self, seconds, expected_interval):
+        """Record latency with coordinated omission correction.
+
+        Closed loop client stalled by a slow response did not send requests it
+        was supposed to send every expected_interval. Latencies they would have
+        had are recorded too, linearly decreasing down to expected_interval.
+
+        :param seconds: Latency in seconds
+        :param expected_interval: Expected interval between requests in seconds
+
+        """
+        self.record(seconds)
+
+        if not expected_interval or expected_interval <= 0:
+            return
+
+        missed = seconds - expected_interval
+        while missed >= expected_interval:
+            self.record(missed)
+            missed -= expected_interval
+
+    def merge(self, other):
+        """Add other histogram values."""
+        if other._bits != self._bits:
+            raise ValueError('Histograms precision differs')
+
+        self._counts.update(other._counts)
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percentile):
+        """Return latency in seconds which percentile of recorded values do not exceed."""
+        if not self.count:
+            return 0
+
+        target = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) / 1000000
+
+        return self.max / 1000000
+
+    def to_dict(self):
+        """Represent histogram summary in milliseconds."""
+        summary = {
+            'count': self.count,
+            'min': (self.min or 0) / 1000,
+            'mean': self.sum / self.count / 1000 if self.count else 0,
+            'max': self.max / 1000,
+        }
+        for percentile in self.PERCENTILES:
+            summary[f'p{percentile:g}'] = self.percentile(percentile) * 1000
+
+        return summary
@@ -0,0 +1,229 @@
+"""Metrics collection and Prometheus text exposition module."""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+import structlog
+
+
+__all__ = (
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'Registry',
+    'REGISTRY',
+    'DEFAULT_BUCKETS',
+)
+
+
+logger = structlog.getLogger('daemon.' + __name__)
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(names, values):
+    """Format labels pairs in Prometheus notation."""
+    if not names:
+        return ''
+
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    """Format sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class CounterChild:
+    """Counter of one labels set."""
+
+    __slots__ = ('value', )
+
+    def __init__(self):
+        """Initialize CounterChild instance."""
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Increase counter."""
+        self.value += amount
+
+    def samples(self):
+        """Yield (suffix, extra labels, value) samples."""
+        yield '', (), self.value
+
+
+class GaugeChild(CounterChild):
+    """Gauge of one labels set."""
+
+    __slots__ = ()
+
+    def set(self, value):
+        """Set gauge value."""
+        self.value = value
+
+    def dec(self, amount=1):
+        """Decrease gauge."""
+        self.value -= amount
+
+
+class HistogramChild:
+    """Fixed buckets histogram of one labels set."""
+
+    __slots__ = ('_bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        """Initialize HistogramChild instance."""
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Count value in the first bucket which upper bound is not less than value."""
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        """Yield (suffix, extra labels, value) samples."""
+        total = 0
+        for bound, count in zip(self._bounds + (float('inf'), ), self.counts):
+            total += count
+            yield '_bucket', (('le', _format_value(float(bound))), ), total
+
+        yield '_sum', (), self.sum
+        yield '_count', (), total
+
+
+class Metric(ABC):
+    """Metric family. Children are created per labels values set."""
+
+    __slots__ = ('name', 'documentation', 'labelnames', '_children')
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Initialize Metric instance.
+
+        :param name: Metric name
+        :param documentation: Metric help
+        :param labelnames: Labels names
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    @abstractmethod
+    def _create_child(self):
+        """Create child metric."""
+
+    def labels(self, *values):
+        """Return child metric of labels values. Keep it to avoid lookups on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._create_child()
+        return child
+
+    def render(self):
+        """Render metric family in Prometheus text format."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+        for values, child in self._children.items():
+            for suffix, extra, value in child.samples():
+                names = self.labelnames + tuple(name for name, _ in extra)
+                label_values = values + tuple(label_value for _, label_value in extra)
+                lines.append(f'{self.name}{suffix}{_format_labels(names, label_values)} {_format_value(value)}')
+
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    __slots__ = ()
+
+    kind = 'counter'
+
+    def _create_child(self):
+        """Create child counter."""
+        return CounterChild()
+
+
+class Gauge(Metric):
+    """Value which can go up and down."""
+
+    __slots__ = ()
+
+    kind = 'gauge'
+
+    def _create_child(self):
+        """Create child gauge."""
+        return GaugeChild()
+
+
+class Histogram(Metric):
+    """Fixed buckets histogram."""
+
+    __slots__ = ('buckets', )
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Initialize Histogram instance."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _create_child(self):
+        """Create child histogram."""
+        return HistogramChild(self.buckets)
+
+
+class Registry:
+    """Metrics registry.
+
+    Collectors are callables returning metrics built on scrape, for values
+    which are cheaper to read on demand than to track.
+
+    """
+
+    __slots__ = ('_metrics', '_collectors')
+
+    def __init__(self):
+        """Initialize Registry instance."""
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        """Register metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Register collector."""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        """Unregister collector."""
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self):
+        """Render all metrics in Prometheus text format. Failed collector is skipped not to fail whole scrape."""
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception:
+                logger.exception('Metrics collector failed', collector=getattr(collector, '__name__', repr(collector)))
+
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
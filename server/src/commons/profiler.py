@@ -0,0 +1,116 @@
+"""Statistical sampling CPU profiler module."""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+
+
+__all__ = (
+    'ProfilerBusy',
+    'SamplingProfiler',
+)
+
+
+class ProfilerBusy(Exception):
+    """Exception to handle concurrent profiling requests."""
+
+
+class SamplingProfiler:
+    """Sample stacks of every process thread from a dedicated sampler thread.
+
+    Sampler only reads frames of other threads, so the event loop thread keeps
+    serving requests while it is profiled. Result is collapsed stacks counter,
+    i.e. ``thread;outer frame;...;inner frame`` keys ready for flamegraph tools.
+
+    """
+
+    __slots__ = ('_interval', '_lock')
+
+    def __init__(self, interval):
+        """Initialize SamplingProfiler instance.
+
+        :param interval: Delay between samples in seconds
+
+        """
+        self._interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Check if profiling is in progress."""
+        return self._lock.locked()
+
+    async def profile(self, duration, loop=None):
+        """Sample stacks for duration seconds without blocking event loop.
+
+        :param duration: Profiling duration in seconds
+        :param loop: Event loop
+        :return: Collapsed stacks counter
+
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy('Profiler is already running')
+
+        loop = loop or asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def complete(result, exception):
+            """Resolve future if awaiting request was not cancelled."""
+            if future.done():
+                return
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        def run():
+            """Sample in sampler thread and hand result over to event loop."""
+            try:
+                result, exception = self.sample(duration), None
+            except Exception as e:
+                result, exception = None, e
+            finally:
+                self._lock.release()
+
+            loop.call_soon_threadsafe(complete, result, exception)
+
+        threading.Thread(target=run, name='profiler', daemon=True).start()
+
+        return await future
+
+    def sample(self, duration):
+        """Sample stacks of all threads except the calling one.
+
+        :param duration: Profiling duration in seconds
+        :return: Collapsed stacks counter
+
+        """
+        stacks = Counter()
+        labels = {}
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})'
+                    stack.append(label)
+                    frame = frame.f_back
+
+                stack.append(names.get(ident, str(ident)))
+                stacks[';'.join(reversed(stack))] += 1
+
+            time.sleep(self._interval)
+
+        return stacks
@@ -0,0 +1,54 @@
+"""Single-flight calls module."""
+
+import asyncio
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    Callers await the shared call through asyncio.shield, so a cancelled
+    caller does not cancel the call other callers are waiting for.
+
+    """
+
+    __slots__ = ('_calls', 'executed', 'coalesced')
+
+    def __init__(self):
+        """Initialize SingleFlight instance."""
+        self._calls = {}
+
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args):
+        """Run func(*args) unless call with the same key is in-flight and return its result.
+
+        :param key: Call key
+        :param func: Coroutine function
+        :return: Call result
+
+        """
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        """Forget finished call."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        # Mark exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self):
+        """Return number of in-flight calls."""
+        return len(self._calls)
@@ -130,13 +130,9 @@ def configure_db(settings):
     if 'slaves' in settings.db:
         return
 
-    pool_size = 50
-    max_overflow = 49
-
+    # Master serves reads too. Pools sizes are derived from settings.pools
     settings.db['slaves'] = [lya.AttrDict({
-        'dsn': settings.db.master['dsn'],
-        'pool_size': pool_size,
-        'max_overflow': max_overflow
+        key: value for key, value in settings.db.master.items() if key not in ('pool_size', 'max_overflow')
     })]
 
 
@@ -4,9 +4,9 @@ import ujson
 from sqlalchemy import event, exc, create_engine
 
 from config import settings
-
-DEFAULT_POOL_SIZE = 5
-DEFAULT_MAX_OVERFLOW = 4
+from commons.metrics import REGISTRY
+from db.metrics import InstrumentedQueuePool, instrument_engine, collect_engines
+from db.pools import get_sync_pool_args
 
 
 def add_engine_pidguard(engine):
@@ -48,22 +48,24 @@ def dispose_engines():
 
 
 ENGINES = {
-    'master': add_engine_pidguard(create_engine(
+    'master': instrument_engine(add_engine_pidguard(create_engine(
         settings.db.master.dsn,
-        pool_size=settings.db.master.get('pool_size', DEFAULT_POOL_SIZE),
-        max_overflow=settings.db.master.get('max_overflow', DEFAULT_MAX_OVERFLOW),
+        **get_sync_pool_args(settings.db.master),
+        poolclass=InstrumentedQueuePool,
         json_deserializer=ujson.loads,
         json_serializer=ujson.dumps
-    )),
+    )), 'master'),
     'slaves': [
-        add_engine_pidguard(create_engine(
+        instrument_engine(add_engine_pidguard(create_engine(
             slave['dsn'],
-            pool_size=slave.get('pool_size', DEFAULT_POOL_SIZE),
-            max_overflow=slave.get('max_overflow', DEFAULT_MAX_OVERFLOW),
+            **get_sync_pool_args(slave),
+            poolclass=InstrumentedQueuePool,
             isolation_level='AUTOCOMMIT',
             json_deserializer=ujson.loads,
             json_serializer=ujson.dumps
-        ))
-        for slave in settings.db.get('slaves', [settings.db.master])
+        )), f'slave{index}')
+        for index, slave in enumerate(settings.db.get('slaves', [settings.db.master]))
     ]
 }
+
+REGISTRY.add_collector(lambda: collect_engines(ENGINES))
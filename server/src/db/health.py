@@ -0,0 +1,172 @@
+"""Database replicas health module."""
+
+import os
+import random
+import threading
+import time
+
+import structlog
+from sqlalchemy import text
+
+from config import settings
+
+
+logger = structlog.getLogger('daemon.' + __name__)
+
+#: Replication lag in seconds. Replica which replayed everything it received is not lagging even if master is idle
+LAG_QUERY = text(
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) '
+    'END'
+)
+
+
+def replica_name(engine):
+    """Return replica engine url without password."""
+    return engine.url.__to_string__(hide_password=True)
+
+
+class ReplicaState:
+    """Last known replica health."""
+
+    __slots__ = ('engine', 'healthy', 'lag', 'latency', 'checked_at')
+
+    def __init__(self, engine, latency):
+        """Initialize ReplicaState instance."""
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0
+        self.latency = latency
+        self.checked_at = time.monotonic()
+
+
+class ReplicaMonitor:
+    """Probe replicas reachability, latency and lag in background thread.
+
+    Healthy replicas are chosen randomly weighted by inverse latency. Replicas
+    which are unreachable, lag more than max_lag seconds or weren't probed for
+    several intervals are ejected until next successful probe.
+
+    """
+
+    def __init__(self, engines, interval, max_lag, timeout, smoothing=0.3):
+        """Initialize ReplicaMonitor instance.
+
+        :param engines: Replicas engines
+        :param interval: Probe interval in seconds
+        :param max_lag: Maximum allowed replication lag in seconds
+        :param timeout: Probe statement timeout in seconds
+        :param smoothing: Latency exponential moving average factor
+
+        """
+        self._interval = interval
+        self._max_lag = max_lag
+        self._timeout = timeout
+        self._smoothing = smoothing
+        self._states = {id(engine): ReplicaState(engine, timeout) for engine in engines}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._stopped = None
+
+    def _ensure_started(self):
+        """Start probing thread in current process. Threads do not survive fork."""
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            pid = os.getpid()
+            if self._pid == pid:
+                return
+
+            # Every run has its own stop event, so a stopped thread can't be revived by restart
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stopped, ), name='replica-monitor', daemon=True
+            )
+            self._thread.start()
+            self._pid = pid
+
+    def stop(self):
+        """Stop probing thread."""
+        with self._lock:
+            if self._stopped is not None:
+                self._stopped.set()
+            self._pid = None
+            self._thread = None
+            self._stopped = None
+
+    def _run(self, stopped):
+        """Probe replicas until stopped. Failed probe must not end monitoring."""
+        while not stopped.is_set():
+            for state in list(self._states.values()):
+                try:
+                    self.probe(state)
+                except Exception:
+                    logger.exception('Replica probe failed', replica=replica_name(state.engine))
+            stopped.wait(self._interval)
+
+    def probe(self, state):
+        """Update replica state."""
+        started = time.monotonic()
+        try:
+            with state.engine.connect() as connection:
+                # Replicas engines are in autocommit mode, so timeout is reset explicitly
+                connection.execute(text(f'SET statement_timeout = {int(self._timeout * 1000)}'))
+                try:
+                    lag = connection.execute(LAG_QUERY).scalar()
+                finally:
+                    connection.execute(text('RESET statement_timeout'))
+        except Exception:
+            if state.healthy:
+                logger.warning('Replica is unreachable', replica=replica_name(state.engine), exc_info=True)
+            state.healthy = False
+            state.checked_at = time.monotonic()
+            return
+
+        latency = time.monotonic() - started
+        state.latency += self._smoothing * (latency - state.latency)
+        state.lag = float(lag or 0)
+        state.healthy = state.lag <= self._max_lag
+        state.checked_at = time.monotonic()
+
+        if not state.healthy:
+            logger.warning('Replica lags', replica=replica_name(state.engine), lag=state.lag)
+
+    def choose(self, engines):
+        """Return healthy replica engine weighted by latency or None if there is no healthy one."""
+        self._ensure_started()
+
+        expired = time.monotonic() - 3 * self._interval - self._timeout
+        candidates = []
+        weights = []
+        for engine in engines:
+            state = self._states.get(id(engine))
+            if state is None:
+                candidates.append(engine)
+                weights.append(1 / self._timeout)
+            elif state.healthy and state.checked_at > expired:
+                candidates.append(engine)
+                weights.append(1 / max(state.latency, 1e-4))
+
+        if not candidates:
+            return None
+
+        return random.choices(candidates, weights)[0]
+
+
+_MONITOR = None
+
+
+def get_replica_monitor():
+    """Return replicas monitor of default engines."""
+    global _MONITOR
+    if _MONITOR is None:
+        from db.engines import ENGINES
+
+        health = settings.replica_health
+        _MONITOR = ReplicaMonitor(ENGINES['slaves'], health.interval, health.max_lag, health.timeout)
+
+    return _MONITOR
@@ -1,15 +1,16 @@
 from contextlib import contextmanager
 
+from functools import partial
+
 import structlog
 import ujson
-import asyncpg
 import asyncpgsa
-from asyncpgsa.connection import SAConnection
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.dialects.postgresql import psycopg2
 
 from config import settings
-from db.engines import ENGINES, DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW
+from db.engines import ENGINES
+from db.pools import AdaptivePool
 from db.sessions import MasterSlaveSession
 
 logger = structlog.getLogger('daemon.' + __name__)
@@ -25,24 +26,40 @@ DEFAULT_DIALECT = psycopg2.dialect(
 DEFAULT_DIALECT.implicit_returning = True
 DEFAULT_DIALECT.use_native_hstore = True
 
+DEFAULT_STATEMENT_CACHE_SIZE = 1024
+
+
+def get_statement_cache_size(database):
+    """Return asyncpg prepared statements cache size for database settings.
+
+    PgBouncer in transaction pooling mode can't keep named prepared statements
+    between transactions, so asyncpg falls back to unnamed ones for it.
+
+    """
+    if database.get('pgbouncer', False):
+        return 0
+
+    return database.get('statement_cache_size', DEFAULT_STATEMENT_CACHE_SIZE)
+
 
 class ConnectionManager:
-    """Database connection manager."""
+    """Database connection manager. Connections are borrowed from async master pool."""
 
-    __slots__ = ('_connection_class', '_loop', '_dsn', '_connection', '_statement_cache_size')
+    __slots__ = ('_loop', '_session_manager', '_context')
 
-    def __init__(self, loop=None, statement_cache_size=0):
-        """Initialize ConnectionManager instance."""
-        class SynctoolConnection(SAConnection):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, dialect=DEFAULT_DIALECT, **kwargs)
+    def __init__(self, loop=None, session_manager=None):
+        """Initialize ConnectionManager instance.
 
-        self._connection_class = SynctoolConnection
-        self._loop = loop
+        :param loop: Event loop
+        :param session_manager: SessionManager which master pool is used. Default: db.db_manager
+
+        """
+        if session_manager is None:
+            from db import db_manager as session_manager
 
-        self._dsn = settings.db.master['dsn']
-        self._connection = None
-        self._statement_cache_size = statement_cache_size
+        self._loop = loop
+        self._session_manager = session_manager
+        self._context = None
 
     def acquire(self):
         """Acquire connection within context."""
@@ -50,26 +67,115 @@ class ConnectionManager:
 
     async def __aenter__(self):
         """Return connection within async context."""
-        self._connection = await asyncpg.connect(
-            self._dsn,
-            connection_class=self._connection_class,
-            loop=self._loop,
-            statement_cache_size=self._statement_cache_size
-        )
-        return self._connection
+        pool = await self._session_manager.async_master(self._loop)
+        self._context = pool.acquire()
+        return await self._context.__aenter__()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Exit from context."""
-        await self._connection.close()
+        """Return connection to pool."""
+        context, self._context = self._context, None
+        await context.__aexit__(exc_type, exc_val, exc_tb)
 
     def __await__(self):
         """Initialize context."""
         return self.__aenter__().__await__()
 
     async def close(self):
-        """Close connection."""
-        if self._connection:
-            await self._connection.close()
+        """Return connection to pool."""
+        if self._context is not None:
+            await self.__aexit__(None, None, None)
+
+
+def create_async_pool(database, loop=None, name=None):
+    """Create adaptive asyncpg pool for database settings."""
+    create_pool = partial(
+        asyncpgsa.create_pool,
+        dialect=DEFAULT_DIALECT,
+        statement_cache_size=get_statement_cache_size(database)
+    )
+    return AdaptivePool.create(create_pool, database, loop, name)
+
+
+class ReplicaPools:
+    """Read-only asyncpg pools of database replicas.
+
+    Connections are acquired from the replica with the fewest outstanding
+    checkouts. Ties are broken round-robin.
+
+    """
+
+    __slots__ = ('_pools', '_outstanding', '_next')
+
+    def __init__(self, pools):
+        """Initialize ReplicaPools instance.
+
+        :param pools: Replicas asyncpg pools
+
+        """
+        self._pools = list(pools)
+        self._outstanding = [0] * len(self._pools)
+        self._next = 0
+
+    def _choose(self):
+        """Return index of the least loaded replica."""
+        count = len(self._pools)
+        start = self._next
+        self._next = (start + 1) % count
+
+        outstanding = self._outstanding
+        best = start
+        for offset in range(1, count):
+            index = (start + offset) % count
+            if outstanding[index] < outstanding[best]:
+                best = index
+
+        return best
+
+    def acquire(self):
+        """Acquire replica connection within context."""
+        return ReplicaConnectionContext(self)
+
+    @property
+    def outstanding(self):
+        """Return outstanding checkouts per replica."""
+        return tuple(self._outstanding)
+
+    async def close(self):
+        """Close all replicas pools."""
+        for pool in self._pools:
+            await pool.close()
+
+
+class ReplicaConnectionContext:
+    """Replica connection acquiring context."""
+
+    __slots__ = ('_replicas', '_index', '_context')
+
+    def __init__(self, replicas):
+        """Initialize ReplicaConnectionContext instance."""
+        self._replicas = replicas
+        self._index = None
+        self._context = None
+
+    async def __aenter__(self):
+        """Acquire connection from the least loaded replica."""
+        replicas = self._replicas
+        self._index = replicas._choose()
+        replicas._outstanding[self._index] += 1
+
+        try:
+            self._context = replicas._pools[self._index].acquire()
+            return await self._context.__aenter__()
+        except BaseException:
+            replicas._outstanding[self._index] -= 1
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release connection."""
+        try:
+            await self._context.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._replicas._outstanding[self._index] -= 1
 
 
 class SessionManager:
@@ -78,6 +184,7 @@ class SessionManager:
     __slots__ = (
         '__master_session_instance',
         '__async_master_instance',
+        '__async_slaves_instance',
         '__open_masters',
     )
 
@@ -85,6 +192,7 @@ class SessionManager:
         """Initialize SessionManager instance."""
         self.__master_session_instance = None
         self.__async_master_instance = None
+        self.__async_slaves_instance = None
         self.__open_masters = 0
 
     @property
@@ -141,23 +249,33 @@ class SessionManager:
     async def async_master(self, loop=None):
         """Return async master session."""
         if self.__async_master_instance is None:
-            master = settings.db.master
-            self.__async_master_instance = await asyncpgsa.create_pool(
-                master['dsn'],
-                min_size=master.get('pool_size', DEFAULT_POOL_SIZE) - master.get('max_overflow', DEFAULT_MAX_OVERFLOW),
-                max_size=master.get('pool_size', DEFAULT_POOL_SIZE) + master.get('max_overflow', DEFAULT_MAX_OVERFLOW),
-                loop=loop,
-                dialect=DEFAULT_DIALECT
-            )
+            self.__async_master_instance = await create_async_pool(settings.db.master, loop, 'async_master')
 
         return self.__async_master_instance
 
+    async def async_slaves(self, loop=None):
+        """Return async read-only replicas pools."""
+        if self.__async_slaves_instance is None:
+            self.__async_slaves_instance = ReplicaPools([
+                await create_async_pool(slave, loop, f'async_slave{index}')
+                for index, slave in enumerate(settings.db.get('slaves', [settings.db.master]))
+            ])
+
+        return self.__async_slaves_instance
+
     async def async_close_master(self):
         """Close async master session."""
         if self.__async_master_instance is not None:
             await self.__async_master_instance.close()
             self.__async_master_instance = None
 
+    async def async_close_slaves(self):
+        """Close async replicas pools."""
+        if self.__async_slaves_instance is not None:
+            await self.__async_slaves_instance.close()
+            self.__async_slaves_instance = None
+
     async def async_close_all(self):
-        """Close async master session."""
+        """Close async master session and replicas pools."""
         await self.async_close_master()
+        await self.async_close_slaves()
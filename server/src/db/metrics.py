@@ -0,0 +1,206 @@
+"""Database connection pools instrumentation module."""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from config import settings
+from commons.metrics import REGISTRY, Gauge, Histogram
+
+
+logger = structlog.getLogger('daemon.' + __name__)
+
+POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+AGE_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 4 * 3600, 24 * 3600)
+
+CHECKOUT_WAIT = REGISTRY.register(Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for pool connection.', ('pool', ), POOL_BUCKETS
+))
+CHECKOUT_DURATION = REGISTRY.register(Histogram(
+    'db_pool_checkout_duration_seconds', 'Time connection was held by caller.', ('pool', ), POOL_BUCKETS
+))
+CONNECTION_AGE = REGISTRY.register(Histogram(
+    'db_pool_connection_age_seconds', 'Connection age at checkout.', ('pool', ), AGE_BUCKETS
+))
+
+#: Async pools by name, collected on scrape
+ASYNC_POOLS = {}
+
+
+class CheckoutTracker:
+    """Track checked out connections to report ones held longer than threshold.
+
+    Leaks are reported on metrics scrape and, when watching, by a background
+    thread every threshold seconds, so they are logged even if nobody scrapes.
+
+    """
+
+    __slots__ = ('_checkouts', '_watch', '_pid', '_lock', 'threshold', 'capture_stacks')
+
+    def __init__(self, threshold, capture_stacks, watch=False):
+        """Initialize CheckoutTracker instance.
+
+        :param threshold: Checkout duration in seconds considered as leak
+        :param capture_stacks: Remember stack which acquired connection
+        :param watch: Check for leaks in background thread
+
+        """
+        self._checkouts = {}
+        self._watch = watch
+        self._pid = None
+        self._lock = threading.Lock()
+        self.threshold = threshold
+        self.capture_stacks = capture_stacks
+
+    def start(self, key, pool):
+        """Register checkout and return its start time."""
+        if self._watch and self._pid != os.getpid():
+            self._start_watching()
+
+        started = time.monotonic()
+        stack = None
+        if self.capture_stacks:
+            # Source lines are not read until the stack is logged, it keeps checkout cheap
+            stack = traceback.StackSummary.extract(
+                traceback.walk_stack(sys._getframe(1)), limit=24, lookup_lines=False
+            )
+            stack.reverse()
+        self._checkouts[key] = [pool, started, stack, False]
+        return started
+
+    def _start_watching(self):
+        """Start leaks watching thread in current process. Threads do not survive fork."""
+        with self._lock:
+            pid = os.getpid()
+            if self._pid == pid:
+                return
+
+            threading.Thread(target=self._run, name='checkout-leaks', daemon=True).start()
+            self._pid = pid
+
+    def _run(self):
+        """Check for leaks every threshold seconds."""
+        while True:
+            time.sleep(max(self.threshold, 1))
+            try:
+                self.leaks()
+            except Exception:
+                logger.exception('Connection leaks check failed')
+
+    def stop(self, key):
+        """Unregister checkout and return its start time."""
+        checkout = self._checkouts.pop(key, None)
+        return checkout[1] if checkout else None
+
+    def leaks(self):
+        """Return {pool: count} of leaked connections. Every leak is logged with its stack once."""
+        with self._lock:
+            return self._leaks()
+
+    def _leaks(self):
+        """Count leaked connections and log the ones which were not reported yet."""
+        expired = time.monotonic() - self.threshold
+        leaks = {}
+
+        for checkout in list(self._checkouts.values()):
+            pool, started, stack, reported = checkout
+            if started > expired:
+                continue
+
+            leaks[pool] = leaks.get(pool, 0) + 1
+            if not reported:
+                logger.warning(
+                    'Connection checkout leaked',
+                    pool=pool, held=time.monotonic() - started, stack=''.join(traceback.format_list(stack or []))
+                )
+                checkout[3] = True
+
+        return leaks
+
+
+CHECKOUTS = CheckoutTracker(settings.metrics.leak_threshold, settings.metrics.capture_stacks, watch=True)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool which measures waiting for a connection."""
+
+    metrics_name = None
+
+    def _do_get(self):
+        """Get connection from pool measuring wait time."""
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            CHECKOUT_WAIT.labels(self.metrics_name).observe(time.monotonic() - started)
+
+    def recreate(self):
+        """Recreate pool keeping its metrics name."""
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def instrument_engine(engine, name):
+    """Collect engine pool metrics under pool name.
+
+    Engine should be created with InstrumentedQueuePool pool class.
+
+    """
+    engine.pool.metrics_name = name
+    duration = CHECKOUT_DURATION.labels(name)
+    age = CONNECTION_AGE.labels(name)
+
+    @event.listens_for(engine, 'connect')
+    def connect(dbapi_connection, connection_record):
+        """On connect to database event."""
+        connection_record.info['created_at'] = time.monotonic()
+
+    @event.listens_for(engine, 'checkout')
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        """On checkout event."""
+        started = CHECKOUTS.start(connection_record, name)
+        age.observe(started - connection_record.info.get('created_at', started))
+
+    @event.listens_for(engine, 'checkin')
+    def checkin(dbapi_connection, connection_record):
+        """On checkin event."""
+        started = CHECKOUTS.stop(connection_record)
+        if started is not None:
+            duration.observe(time.monotonic() - started)
+
+    return engine
+
+
+def collect_engines(engines):
+    """Build pools gauges of SQLAlchemy engines."""
+    in_use = Gauge('db_pool_connections_in_use', 'Checked out connections.', ('pool', ))
+    idle = Gauge('db_pool_connections_idle', 'Idle connections kept by pool.', ('pool', ))
+    overflow = Gauge('db_pool_overflow_in_use', 'Connections opened above pool size.', ('pool', ))
+    size = Gauge('db_pool_size', 'Pool size or async pool concurrency limit.', ('pool', ))
+
+    for engine in [engines['master']] + list(engines['slaves']):
+        pool = engine.pool
+        name = pool.metrics_name
+        in_use.labels(name).set(pool.checkedout())
+        idle.labels(name).set(pool.checkedin())
+        overflow.labels(name).set(max(pool.overflow(), 0))
+        size.labels(name).set(pool.size())
+
+    for name, pool in ASYNC_POOLS.items():
+        in_use.labels(name).set(pool.in_use)
+        idle.labels(name).set(max(pool.open_connections - pool.in_use, 0))
+        overflow.labels(name).set(max(pool.in_use - pool.min_size, 0))
+        size.labels(name).set(pool.limit)
+
+    leaked = Gauge('db_pool_leaked_connections', 'Connections held longer than leak threshold.', ('pool', ))
+    for name, count in CHECKOUTS.leaks().items():
+        leaked.labels(name).set(count)
+
+    return in_use, idle, overflow, size, leaked
@@ -2,6 +2,8 @@
 
 from invoke import Collection
 from db.migrations.tasks.create import create
+from db.migrations.tasks.import_articles import import_articles
+from db.migrations.tasks.index_advisor import index_advisor
 from db.migrations.tasks.shell import shell
 from db.migrations.tasks.upgrade import upgrade, downgrade
 
@@ -9,4 +11,6 @@ ns = Collection('db', create)
 ns.add_task(upgrade)
 ns.add_task(downgrade)
 ns.add_task(shell)
+ns.add_task(index_advisor)
+ns.add_task(import_articles)
 
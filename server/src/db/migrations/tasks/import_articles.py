@@ -0,0 +1,205 @@
+"""Bulk articles import task."""
+
+import asyncio
+import csv
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import cpu_count
+
+import asyncpg
+import ujson
+from invoke import task
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from config import settings
+
+
+DEFAULT_DB_ALIAS = 'master'
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+# Foreign keys are given either as ids or as category title and user login
+STAGING_COLUMNS = ('title', 'content', 'category_id', 'category_title', 'user_id', 'user_login')
+
+CREATE_STAGING = (
+    'CREATE UNLOGGED TABLE {table} '
+    '(title TEXT, content TEXT, category_id INTEGER, category_title TEXT, user_id INTEGER, user_login TEXT)'
+)
+
+CREATE_CATEGORIES = (
+    'INSERT INTO category (title) '
+    'SELECT DISTINCT s.category_title FROM {table} s '
+    'WHERE s.category_id IS NULL AND s.category_title IS NOT NULL '
+    'AND NOT EXISTS (SELECT 1 FROM category c WHERE c.title = s.category_title)'
+)
+
+MERGE_ARTICLES = (
+    'INSERT INTO article (title, content, category_id, user_id) '
+    'SELECT s.title, s.content, coalesce(s.category_id, c.id), coalesce(s.user_id, u.id) FROM {table} s '
+    'LEFT JOIN (SELECT title, min(id) AS id FROM category GROUP BY title) c '
+    'ON s.category_id IS NULL AND c.title = s.category_title '
+    'LEFT JOIN "user" u ON s.user_id IS NULL AND u.login = s.user_login '
+    'WHERE s.title IS NOT NULL AND s.content IS NOT NULL '
+    'AND coalesce(s.category_id, c.id) IN (SELECT id FROM category) '
+    'AND coalesce(s.user_id, u.id) IN (SELECT id FROM "user")'
+)
+
+#: PostgreSQL INTEGER range
+MIN_INT, MAX_INT = -2 ** 31, 2 ** 31 - 1
+
+_LOOP = None
+_CONNECTION = None
+
+
+def _int(value):
+    """Convert optional integer field. Malformed one is NULL, so the reference is resolved by name or skipped."""
+    if value in (None, '') or isinstance(value, (bool, float)):
+        return None
+
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+
+    return value if MIN_INT <= value <= MAX_INT else None
+
+
+def _text(value):
+    """Convert optional text field. PostgreSQL text can not contain NUL characters."""
+    return value if isinstance(value, str) and '\x00' not in value else None
+
+
+def _record(values):
+    """Convert input row to staging table record or return None if row is malformed."""
+    if not isinstance(values, dict):
+        return None
+
+    return (
+        _text(values.get('title')),
+        _text(values.get('content')),
+        _int(values.get('category_id')),
+        _text(values.get('category')) or None,
+        _int(values.get('user_id')),
+        _text(values.get('user')) or None,
+    )
+
+
+def _init_worker(dsn):
+    """Open worker process connection."""
+    global _LOOP, _CONNECTION
+
+    _LOOP = asyncio.new_event_loop()
+    _CONNECTION = _LOOP.run_until_complete(asyncpg.connect(dsn))
+
+
+def _loads(line):
+    """Parse NDJSON line or return None if it is malformed."""
+    try:
+        return ujson.loads(line)
+    except ValueError:
+        return None
+
+
+def _copy_chunk(table, fmt, rows):
+    """Parse chunk in worker process and COPY it into staging table.
+
+    :return: (staged rows, rejected malformed rows) pair
+
+    """
+    parsed = map(_loads, rows) if fmt == 'ndjson' else rows
+
+    records = [record for record in map(_record, parsed) if record is not None]
+    _LOOP.run_until_complete(_CONNECTION.copy_records_to_table(table, records=records, columns=STAGING_COLUMNS))
+
+    return len(records), len(rows) - len(records)
+
+
+def _read_chunks(path, fmt, chunk_size):
+    """Yield lists of raw NDJSON lines or CSV dicts."""
+    with open(path, newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+        rows = csv.DictReader(f) if fmt == 'csv' else (line for line in f if line.strip())
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def _progress(rows, started):
+    """Print staged rows and rate."""
+    elapsed = time.monotonic() - started
+    sys.stdout.write(f'staged rows: {rows}, {rows / elapsed if elapsed else 0:.0f} rows/sec\r')
+    sys.stdout.flush()
+
+
+@task(
+    help={
+        'path': 'CSV or NDJSON file with title, content, category_id or category (title), user_id or user (login).',
+        'fmt': 'csv or ndjson. Default: by file extension.',
+        'workers': 'Number of worker processes. Default: number of CPUs.',
+        'chunk_size': 'Rows per COPY. Default: 50000.',
+        'create_categories': 'Create categories missed by title. Default: False.',
+        'db': 'Database name, default: master.',
+    }
+)
+def import_articles(ctx, path, fmt=None, workers=None, chunk_size=50000, create_categories=False,
+                    db=DEFAULT_DB_ALIAS):
+    """Load articles from CSV or NDJSON file with parallel COPY and set-wise merge."""
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in FORMATS.values():
+        print(f'Unknown file format: {path}. Use --fmt csv or --fmt ndjson')
+        return
+
+    if db not in settings.db:
+        print("Wrong database name: {}. Available databases: {}".format(db, ', '.join(settings.db.keys())))
+        return
+
+    dsn = settings.db[db].dsn
+    workers = int(workers or cpu_count())
+    table = f'article_import_{uuid.uuid4().hex[:12]}'
+    engine = create_engine(dsn, poolclass=NullPool)
+
+    engine.execute(CREATE_STAGING.format(table=table))
+    try:
+        started = time.monotonic()
+        staged = rejected = 0
+
+        # At most two chunks per worker are read ahead, memory does not depend on file size
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dsn, )) as executor:
+            pending = set()
+            for chunk in _read_chunks(path, fmt, int(chunk_size)):
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk_staged, chunk_rejected = future.result()
+                        staged += chunk_staged
+                        rejected += chunk_rejected
+                    _progress(staged, started)
+
+                pending.add(executor.submit(_copy_chunk, table, fmt, chunk))
+
+            for future in pending:
+                chunk_staged, chunk_rejected = future.result()
+                staged += chunk_staged
+                rejected += chunk_rejected
+            _progress(staged, started)
+
+        with engine.begin() as connection:
+            if create_categories:
+                connection.execute(CREATE_CATEGORIES.format(table=table))
+            imported = connection.execute(MERGE_ARTICLES.format(table=table)).rowcount
+
+        elapsed = time.monotonic() - started
+        print(f'\nimported: {imported}, skipped: {staged + rejected - imported} (malformed: {rejected}), '
+              f'{elapsed:.1f} sec, {imported / elapsed if elapsed else 0:.0f} rows/sec')
+    finally:
+        engine.execute(f'DROP TABLE IF EXISTS {table}')
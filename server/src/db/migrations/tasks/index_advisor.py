@@ -0,0 +1,122 @@
+"""Index advisor task."""
+
+import re
+
+from invoke import task
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from config import settings
+
+
+DEFAULT_DB_ALIAS = 'master'
+
+SEQ_SCAN_TABLES = text(
+    'SELECT relid, relname, seq_scan, seq_tup_read, coalesce(idx_scan, 0) AS idx_scan, n_live_tup '
+    'FROM pg_stat_user_tables '
+    'WHERE seq_scan > coalesce(idx_scan, 0) AND n_live_tup >= :min_rows '
+    'ORDER BY seq_tup_read DESC '
+    'LIMIT :limit'
+)
+
+# Columns which are not the leading column of any index
+UNINDEXED_COLUMNS = text(
+    'SELECT a.attname FROM pg_attribute a '
+    'WHERE a.attrelid = :relid AND a.attnum > 0 AND NOT a.attisdropped '
+    'AND NOT EXISTS (SELECT 1 FROM pg_index i WHERE i.indrelid = a.attrelid AND i.indkey[0] = a.attnum)'
+)
+
+UNINDEXED_FOREIGN_KEYS = text(
+    'SELECT c.conrelid::regclass::text AS relname, a.attname '
+    'FROM pg_constraint c '
+    'JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1] '
+    "WHERE c.contype = 'f' "
+    'AND NOT EXISTS (SELECT 1 FROM pg_index i WHERE i.indrelid = c.conrelid AND i.indkey[0] = c.conkey[1]) '
+    'ORDER BY 1, 2'
+)
+
+HAS_PG_STAT_STATEMENTS = text("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+
+# total_time was renamed to total_exec_time in PostgreSQL 13
+TOP_STATEMENTS = (
+    'SELECT query, calls, {total_time} AS total_time, rows FROM pg_stat_statements '
+    'WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) '
+    'ORDER BY {total_time} DESC '
+    'LIMIT :limit'
+)
+
+
+def _predicate_columns(query, table, columns):
+    """Find table columns compared in query predicates."""
+    if not re.search(rf'\b{re.escape(table)}\b', query, re.IGNORECASE):
+        return set()
+
+    found = set()
+    for column in columns:
+        pattern = rf'"?\b{re.escape(column)}\b"?\s*(=|<|>|\bIN\b|\bLIKE\b|\bBETWEEN\b)'
+        if re.search(pattern, query, re.IGNORECASE):
+            found.add(column)
+
+    return found
+
+
+@task(
+    help={
+        'db': 'Database name, default: master.',
+        'min_rows': 'Ignore tables with less live rows, default: 1000.',
+        'limit': 'Number of reported tables and statements, default: 10.',
+    }
+)
+def index_advisor(ctx, db=DEFAULT_DB_ALIAS, min_rows=1000, limit=10):
+    """Report sequential scan heavy tables, unindexed foreign keys and candidate indexes."""
+    if db not in settings.db:
+        print("Wrong database name: {}. Available databases: {}".format(db, ', '.join(settings.db.keys())))
+        return
+
+    engine = create_engine(settings.db[db].dsn, poolclass=NullPool)
+
+    with engine.connect() as connection:
+        tables = connection.execute(SEQ_SCAN_TABLES, min_rows=min_rows, limit=limit).fetchall()
+        foreign_keys = connection.execute(UNINDEXED_FOREIGN_KEYS).fetchall()
+
+        statements = []
+        if connection.execute(HAS_PG_STAT_STATEMENTS).scalar():
+            version = connection.execute(text('SHOW server_version_num')).scalar()
+            total_time = 'total_exec_time' if int(version) >= 130000 else 'total_time'
+            statements = connection.execute(
+                text(TOP_STATEMENTS.format(total_time=total_time)), limit=limit
+            ).fetchall()
+
+        unindexed = {
+            table.relname: [row.attname for row in connection.execute(UNINDEXED_COLUMNS, relid=table.relid)]
+            for table in tables
+        }
+
+    print('Sequential scan heavy tables:')
+    print(f'{"table":30} {"seq_scan":>12} {"seq_tup_read":>14} {"idx_scan":>12} {"live rows":>12}')
+    for table in tables:
+        print(
+            f'{table.relname:30} {table.seq_scan:12} {table.seq_tup_read:14} '
+            f'{table.idx_scan:12} {table.n_live_tup:12}'
+        )
+
+    print('\nForeign keys without index:')
+    for row in foreign_keys:
+        print(f'{row.relname}.{row.attname}')
+
+    if not statements:
+        print('\npg_stat_statements extension is not installed, statements are not analyzed')
+    else:
+        print('\nTop statements by total time:')
+        for statement in statements:
+            query = ' '.join(statement.query.split())
+            print(f'{statement.total_time:12.0f} ms {statement.calls:10} calls  {query[:200]}')
+
+    candidates = {(row.relname.strip('"'), row.attname) for row in foreign_keys}
+    for table, columns in unindexed.items():
+        for statement in statements:
+            candidates.update((table, column) for column in _predicate_columns(statement.query, table, columns))
+
+    print('\nCandidate indexes:')
+    for table, column in sorted(candidates):
+        print(f'CREATE INDEX CONCURRENTLY ix_{table}_{column} ON "{table}" ({column});')
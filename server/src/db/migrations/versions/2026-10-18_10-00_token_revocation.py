@@ -0,0 +1,28 @@
+"""token revocation
+
+Revision ID: 3b1e6c2f9a41
+Revises: f9871c858a1d
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+# revision identifiers, used by Alembic.
+revision = '3b1e6c2f9a41'
+down_revision = 'f9871c858a1d'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('token_revocation',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('not_before', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('token_revocation')
@@ -0,0 +1,42 @@
+"""lookup indexes
+
+Revision ID: 7c4d2a9e5b13
+Revises: 3b1e6c2f9a41
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+# revision identifiers, used by Alembic.
+revision = '7c4d2a9e5b13'
+down_revision = '3b1e6c2f9a41'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+# CONCURRENTLY does not lock tables for writes, but can not run inside transaction.
+# Unique index build fails on duplicated logins and leaves INVALID index, it should be dropped
+# after duplicates are resolved, then migration rerun.
+INDEXES = (
+    ('ix_user_login', 'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_user_login ON "user" (login)'),
+    ('ix_user_token', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_token ON "user" (token) '
+                      'WHERE token IS NOT NULL'),
+    ('ix_article_user_id', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_article_user_id ON article (user_id)'),
+    ('ix_article_category_id', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_article_category_id '
+                               'ON article (category_id)'),
+)
+
+
+def upgrade():
+    # Finish migration transaction, the following statements are autocommitted
+    op.execute('COMMIT')
+
+    for _, statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade():
+    op.execute('COMMIT')
+
+    for name, _ in reversed(INDEXES):
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,73 @@
+"""article search
+
+Revision ID: 9e2f6b3c1d87
+Revises: 7c4d2a9e5b13
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+# revision identifiers, used by Alembic.
+revision = '9e2f6b3c1d87'
+down_revision = '7c4d2a9e5b13'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import text
+
+
+# Stored generated column would rewrite the whole table under ACCESS EXCLUSIVE lock. Nullable column without
+# default is added instantly, trigger keeps new and changed rows up to date and existing rows are backfilled
+# in short batches, each in its own transaction. Title matches rank higher than content ones.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}content, '')), 'B')"
+)
+
+CREATE_TRIGGER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION article_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGER = (
+    'CREATE TRIGGER article_search_vector_update BEFORE INSERT OR UPDATE OF title, content ON article '
+    'FOR EACH ROW EXECUTE PROCEDURE article_search_vector_update()'
+)
+
+BACKFILL = text(
+    f'UPDATE article SET search_vector = {SEARCH_VECTOR.format(row="")} '
+    'WHERE id > :low AND id <= :high AND search_vector IS NULL'
+)
+
+BACKFILL_BATCH = 10000
+
+
+def upgrade():
+    op.execute('ALTER TABLE article ADD COLUMN search_vector tsvector')
+    op.execute(CREATE_TRIGGER_FUNCTION)
+    op.execute(CREATE_TRIGGER)
+
+    # Rows written from now on are covered by trigger, the following statements are autocommitted
+    op.execute('COMMIT')
+
+    connection = op.get_bind()
+    max_id = connection.execute('SELECT max(id) FROM article').scalar() or 0
+    for low in range(0, max_id, BACKFILL_BATCH):
+        connection.execute(BACKFILL, low=low, high=low + BACKFILL_BATCH)
+        op.execute('COMMIT')
+
+    # Index is built without blocking writes
+    op.execute(
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_article_search_vector ON article USING gin (search_vector)'
+    )
+
+
+def downgrade():
+    op.execute('COMMIT')
+    op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_article_search_vector')
+    op.execute('DROP TRIGGER IF EXISTS article_search_vector_update ON article')
+    op.execute('DROP FUNCTION IF EXISTS article_search_vector_update()')
+    op.execute('ALTER TABLE article DROP COLUMN IF EXISTS search_vector')
@@ -10,7 +10,10 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    FetchedValue,
+    Float,
     inspect,
+    Index,
     Integer,
     ForeignKey,
     MetaData,
@@ -18,7 +21,8 @@ from sqlalchemy import (
     String,
     SmallInteger,
     TIMESTAMP,
-    Text
+    Text,
+    text
 )
 from sqlalchemy.ext.declarative import as_declarative
 from sqlalchemy.orm import object_session, relationship
@@ -31,7 +35,8 @@ __all__ = (
     'Base',
     'User',
     'Category',
-    'Article'
+    'Article',
+    'TokenRevocation'
 )
 
 
@@ -99,9 +104,12 @@ class Base(ModelBase):
 
 class User(Base):
     __tablename__ = 'user'
+    __table_args__ = (
+        Index('ix_user_token', 'token', postgresql_where=text('token IS NOT NULL')),
+    )
 
     id = Column(Integer, primary_key=True)
-    login = Column(String, nullable=False)
+    login = Column(String, nullable=False, unique=True, index=True)
     password = Column(String, nullable=False)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
@@ -121,13 +129,26 @@ class Category(Base):
 
 class Article(Base):
     __tablename__ = 'article'
+    __table_args__ = (
+        Index('ix_article_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
 
-    category_id = Column(Integer, ForeignKey('category.id'), nullable=False)
-    user_id = Column(Integer, ForeignKey('user.id'), nullable=False)
+    category_id = Column(Integer, ForeignKey('category.id'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('user.id'), nullable=False, index=True)
+
+    # Kept up to date from title and content by database trigger
+    search_vector = Column(postgresql.TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
     category = relationship("Category", back_populates="articles")
     user = relationship("User", back_populates="articles")
+
+
+class TokenRevocation(Base):
+    __tablename__ = 'token_revocation'
+
+    user_id = Column(Integer, ForeignKey('user.id'), primary_key=True)
+    not_before = Column(Float, nullable=False)
@@ -0,0 +1,265 @@
+"""Database connection pools sizing module."""
+
+import asyncio
+import os
+import time
+from collections import deque
+from functools import partial
+
+from config import settings
+from commons.helpers import Constants
+from db.metrics import ASYNC_POOLS, CHECKOUTS, CHECKOUT_WAIT, CHECKOUT_DURATION
+
+
+__all__ = (
+    'PoolKind',
+    'get_pool_limits',
+    'get_sync_pool_args',
+    'AdaptivePool',
+)
+
+
+class PoolKind(Constants):
+    """Pools sharing database server connections budget."""
+
+    SYNC = 'sync'
+    ASYNC = 'async'
+
+
+def _get_workers():
+    """Return number of processes of the deployment. WEB_CONCURRENCY overrides settings."""
+    return int(os.environ.get('WEB_CONCURRENCY', settings.pools.workers))
+
+
+def get_pool_limits(database, kind):
+    """Return (min_size, max_size) of pool for database settings.
+
+    Explicit pool_size and max_overflow of database are used as is. Otherwise
+    server max_connections without reserved ones are split between worker
+    processes, then between pool kinds and pools connected to the same dsn.
+
+    :param database: Database settings
+    :param kind: PoolKind
+    :rtype: tuple
+
+    """
+    if 'pool_size' in database:
+        pool_size = database['pool_size']
+        return pool_size, pool_size + database.get('max_overflow', 0)
+
+    pools = settings.pools
+    databases = [settings.db.master] + list(settings.db.get('slaves', []))
+    same_server = sum(1 for item in databases if item['dsn'] == database['dsn'])
+
+    budget = (pools.max_connections - pools.reserved_connections) // _get_workers()
+    max_size = max(1, int(budget * pools.shares[kind]) // max(same_server, 1))
+    min_size = max(1, max_size // 4)
+
+    return min_size, max_size
+
+
+def get_sync_pool_args(database):
+    """Return SQLAlchemy QueuePool arguments for database settings."""
+    min_size, max_size = get_pool_limits(database, PoolKind.SYNC)
+    return {'pool_size': min_size, 'max_overflow': max_size - min_size}
+
+
+#: asyncpg pool methods acquiring connection on their own, they are run within adaptive limit instead
+QUERY_METHODS = frozenset((
+    'execute', 'executemany', 'fetch', 'fetchrow', 'fetchval',
+    'copy_from_table', 'copy_from_query', 'copy_to_table', 'copy_records_to_table',
+))
+
+
+class AdaptivePool:
+    """asyncpg pool which concurrency limit follows observed acquire wait time.
+
+    Limit grows while average wait in adjust interval exceeds wait target and
+    shrinks while waits are negligible and limit is not reached. asyncpg opens
+    connections only up to the limit and closes the ones idle for max idle time,
+    so the number of open connections follows the limit.
+
+    """
+
+    __slots__ = (
+        '_pool', '_loop', 'name', 'min_size', 'max_size', 'limit', 'in_use', '_waiters', '_wait', '_duration',
+        '_wait_target', '_adjust_interval', '_window_started', '_window_wait', '_window_acquires', '_window_peak',
+    )
+
+    def __init__(self, pool, min_size, max_size, wait_target, adjust_interval, loop=None, name=None):
+        """Initialize AdaptivePool instance.
+
+        :param pool: asyncpg pool created with max_size connections
+        :param min_size: Minimum concurrency limit
+        :param max_size: Maximum concurrency limit
+        :param wait_target: Acquire wait in seconds above which limit grows
+        :param adjust_interval: Limit adjusting interval in seconds
+        :param loop: Event loop
+        :param name: Pool name in metrics
+
+        """
+        self._pool = pool
+        self._loop = loop or asyncio.get_event_loop()
+        self.name = name
+        self._wait = CHECKOUT_WAIT.labels(name)
+        self._duration = CHECKOUT_DURATION.labels(name)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.limit = min_size
+        self.in_use = 0
+        self._waiters = deque()
+
+        self._wait_target = wait_target
+        self._adjust_interval = adjust_interval
+        self._window_started = self._loop.time()
+        self._window_wait = 0.0
+        self._window_acquires = 0
+        self._window_peak = 0
+
+    @classmethod
+    async def create(cls, create_pool, database, loop=None, name=None):
+        """Create adaptive pool for database settings.
+
+        :param create_pool: asyncpg pool factory
+        :param database: Database settings
+        :param loop: Event loop
+        :param name: Pool name in metrics
+
+        """
+        min_size, max_size = get_pool_limits(database, PoolKind.ASYNC)
+        pools = settings.pools
+
+        pool = await create_pool(
+            database['dsn'],
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=pools.max_idle_time,
+            loop=loop
+        )
+        adaptive_pool = cls(pool, min_size, max_size, pools.wait_target, pools.adjust_interval, loop=loop, name=name)
+        if name is not None:
+            ASYNC_POOLS[name] = adaptive_pool
+
+        return adaptive_pool
+
+    def acquire(self):
+        """Acquire connection within context."""
+        return AdaptiveConnectionContext(self)
+
+    async def _acquire_slot(self):
+        """Wait until in use connections are below limit."""
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            self._record(0.0)
+            return
+
+        started = self._loop.time()
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over right before cancellation
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+        self._record(self._loop.time() - started)
+
+    def _release_slot(self):
+        """Return slot and hand it over to the next waiter."""
+        self.in_use -= 1
+        self._wake_up()
+
+    def _wake_up(self):
+        """Hand over free slots to waiters."""
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+    def _record(self, wait):
+        """Account acquire wait and adjust limit once per interval."""
+        self._window_wait += wait
+        self._window_acquires += 1
+        if self.in_use > self._window_peak:
+            self._window_peak = self.in_use
+
+        now = self._loop.time()
+        if now - self._window_started < self._adjust_interval:
+            return
+
+        average_wait = self._window_wait / self._window_acquires
+        if average_wait > self._wait_target and self.limit < self.max_size:
+            self.limit = min(self.max_size, self.limit + max(1, self.limit // 4))
+            self._wake_up()
+        elif average_wait < self._wait_target / 10 and self._window_peak < self.limit - 1 \
+                and self.limit > self.min_size:
+            self.limit -= 1
+
+        self._window_started = now
+        self._window_wait = 0.0
+        self._window_acquires = 0
+        self._window_peak = self.in_use
+
+    @property
+    def open_connections(self):
+        """Return number of open connections."""
+        return sum(1 for holder in self._pool._holders if holder._con is not None)
+
+    async def close(self):
+        """Close pool."""
+        if ASYNC_POOLS.get(self.name) is self:
+            del ASYNC_POOLS[self.name]
+        await self._pool.close()
+
+    async def _query(self, name, *args, **kwargs):
+        """Run asyncpg connection method on connection acquired within limit."""
+        async with self.acquire() as connection:
+            return await getattr(connection, name)(*args, **kwargs)
+
+    def __getattr__(self, name):
+        """Proxy other attributes to asyncpg pool. Query methods are run within limit."""
+        if name in QUERY_METHODS:
+            return partial(self._query, name)
+        return getattr(self._pool, name)
+
+
+class AdaptiveConnectionContext:
+    """Adaptive pool connection acquiring context."""
+
+    __slots__ = ('_pool', '_connection')
+
+    def __init__(self, pool):
+        """Initialize AdaptiveConnectionContext instance."""
+        self._pool = pool
+        self._connection = None
+
+    async def __aenter__(self):
+        """Acquire connection when pool limit allows."""
+        pool = self._pool
+        started = time.monotonic()
+        await pool._acquire_slot()
+
+        try:
+            self._connection = await pool._pool.acquire()
+        except BaseException:
+            pool._release_slot()
+            raise
+
+        pool._wait.observe(CHECKOUTS.start(self, pool.name) - started)
+        return self._connection
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release connection."""
+        pool = self._pool
+        try:
+            await pool._pool.release(self._connection)
+        finally:
+            self._connection = None
+            pool._release_slot()
+            pool._duration.observe(time.monotonic() - CHECKOUTS.stop(self))
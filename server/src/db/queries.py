@@ -0,0 +1,92 @@
+"""Precompiled SQL statements module."""
+
+from db.manager import DEFAULT_DIALECT
+
+
+__all__ = (
+    'Query',
+)
+
+
+class Query:
+    """SQLAlchemy Core statement compiled to asyncpg SQL once per shape.
+
+    Variable values should be declared with bindparam() and passed as keyword
+    arguments on execution. Compiled SQL text is the same for every call, so
+    asyncpg statement cache keeps it prepared on each pooled connection.
+    Python side column defaults are not applied.
+
+    """
+
+    __slots__ = ('_statement', '_sql', '_params')
+
+    def __init__(self, statement):
+        """Initialize Query instance.
+
+        :param statement: SQLAlchemy Core statement
+
+        """
+        self._statement = statement
+        self._sql = None
+        self._params = None
+
+    def _compile(self):
+        """Compile statement to SQL with positional parameters."""
+        compiled = self._statement.compile(dialect=DEFAULT_DIALECT)
+        processors = compiled._bind_processors
+
+        names = sorted(compiled.params)
+        self._sql = compiled.string % {name: f'${position}' for position, name in enumerate(names, start=1)}
+        self._params = tuple(
+            (name, compiled.params[name], processors.get(name))
+            for name in names
+        )
+
+    @property
+    def sql(self):
+        """Return compiled SQL."""
+        if self._sql is None:
+            self._compile()
+        return self._sql
+
+    def args(self, values):
+        """Return positional arguments for compiled SQL.
+
+        :param values: Bind parameters values. Missed ones fall back to statement literals
+        :type values: dict
+        :rtype: list
+
+        """
+        if self._params is None:
+            self._compile()
+
+        args = []
+        for name, default, processor in self._params:
+            value = values.get(name, default)
+            args.append(processor(value) if processor is not None else value)
+
+        return args
+
+    async def fetch(self, connection, **values):
+        """Return all rows."""
+        return await connection.fetch(self.sql, *self.args(values))
+
+    async def fetchrow(self, connection, **values):
+        """Return first row."""
+        return await connection.fetchrow(self.sql, *self.args(values))
+
+    async def fetchval(self, connection, **values):
+        """Return first column of first row."""
+        return await connection.fetchval(self.sql, *self.args(values))
+
+    def cursor(self, connection, prefetch=None, **values):
+        """Return server-side cursor iterating rows. Should be used inside transaction."""
+        return connection.cursor(self.sql, *self.args(values), prefetch=prefetch)
+
+    async def execute(self, connection, **values):
+        """Execute statement and return status."""
+        return await connection.execute(self.sql, *self.args(values))
+
+    def __str__(self):
+        """Represent query as SQL."""
+        return self.sql
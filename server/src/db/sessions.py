@@ -1,9 +1,8 @@
-import random
-
 from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from db.engines import ENGINES
+from db.health import get_replica_monitor
 
 
 class ServerError(Exception):
@@ -56,5 +55,6 @@ class MasterSlaveSession:
             kwargs['bind'] = engines['master']
             return MasterSession(**kwargs)
         else:
-            kwargs['bind'] = random.choice(engines['slaves'])
+            # Read from master when there is no healthy replica
+            kwargs['bind'] = get_replica_monitor().choose(engines['slaves']) or engines['master']
             return SlaveSession(**kwargs)
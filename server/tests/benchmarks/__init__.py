@@ -0,0 +1,8 @@
+"""API hot functions microbenchmarks.
+
+Run from server directory:
+
+    python -m tests.benchmarks --save baseline.json
+    python -m tests.benchmarks --compare baseline.json --threshold 0.1
+
+"""
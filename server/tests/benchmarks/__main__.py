@@ -0,0 +1,10 @@
+import sys
+
+from config import settings
+from commons.helpers import get_event_loop
+from .runner import main
+from . import suite # noqa
+
+
+with settings.override({'salt': 'benchmarks'}):
+    sys.exit(main(get_event_loop()))
@@ -0,0 +1,155 @@
+"""Microbenchmarks registry, timer and baselines comparison."""
+
+import argparse
+import statistics
+import sys
+import time
+
+import ujson
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register synchronous function without arguments as benchmark."""
+    def decorator(func):
+        BENCHMARKS[name] = (False, func)
+        return func
+
+    return decorator
+
+
+def async_benchmark(name):
+    """Register async context manager factory yielding coroutine function as benchmark."""
+    def decorator(setup):
+        BENCHMARKS[name] = (True, setup)
+        return setup
+
+    return decorator
+
+
+def _summary(timings, number):
+    """Represent per operation timings in nanoseconds."""
+    per_op = [timing / number * 1e9 for timing in timings]
+    return {'min': min(per_op), 'median': statistics.median(per_op), 'number': number, 'repeat': len(per_op)}
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """Time synchronous function.
+
+    Number of calls per repeat doubles until it takes at least min_time seconds.
+
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - started)
+
+    return _summary(timings, number)
+
+
+async def measure_async(func, repeat=5, min_time=0.2):
+    """Time coroutine function, see measure()."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            await func()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            await func()
+        timings.append(time.perf_counter() - started)
+
+    return _summary(timings, number)
+
+
+def run(loop, names=None, repeat=5, min_time=0.2):
+    """Run registered benchmarks and return results by name."""
+    results = {}
+
+    for name, (is_async, func) in BENCHMARKS.items():
+        if names and not any(part in name for part in names):
+            continue
+
+        if is_async:
+            async def run_async():
+                async with func() as operation:
+                    return await measure_async(operation, repeat, min_time)
+
+            results[name] = loop.run_until_complete(run_async())
+        else:
+            results[name] = measure(func, repeat, min_time)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Find benchmarks which minimal time grew more than threshold share of baseline.
+
+    :return: List of (name, baseline ns, current ns, ratio)
+
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        ratio = result['min'] / baseline[name]['min']
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name]['min'], result['min'], ratio))
+
+    return regressions
+
+
+def main(loop, argv=None):
+    """Run benchmarks from command line and return exit code."""
+    parser = argparse.ArgumentParser(prog='python -m tests.benchmarks')
+    parser.add_argument('names', nargs='*', help='Run benchmarks which names contain any of given parts')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimal repeat duration in seconds')
+    parser.add_argument('--save', help='Save results as JSON baseline')
+    parser.add_argument('--compare', help='Compare results with JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed slowdown share. Default: 0.1')
+    args = parser.parse_args(argv)
+
+    results = run(loop, args.names, args.repeat, args.min_time)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = ujson.loads(f.read())
+
+    for name, result in results.items():
+        line = f'{name:40} {result["min"]:12.0f} ns  (median {result["median"]:.0f} ns)'
+        if name in baseline:
+            line += f'  {result["min"] / baseline[name]["min"]:.2f}x baseline'
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            f.write(ujson.dumps(results, indent=2))
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f'REGRESSION {name}: {before:.0f} ns -> {after:.0f} ns ({ratio:.2f}x)', file=sys.stderr)
+
+    return 1 if regressions else 0
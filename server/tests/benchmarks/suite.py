@@ -0,0 +1,95 @@
+"""API hot functions benchmarks."""
+
+from contextlib import asynccontextmanager
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from api.app import init_server
+from api.auth import PRINCIPAL_BY_TOKEN
+from api.constants import Errors, Status
+from api.helpers import json_response
+from api.v1.handlers.auth import USER_BY_LOGIN as AUTH_USER_BY_LOGIN, UPDATE_USER_TOKENS
+from api.v1.handlers.logout import CLEAR_USER_TOKEN
+from api.v1.handlers.register import USER_BY_LOGIN, INSERT_USER
+from commons.helpers import get_password, generate_token
+from db.models import User
+from db.queries import Query
+from .runner import benchmark, async_benchmark
+
+
+@benchmark('helpers.json_response')
+def bench_json_response():
+    json_response(data={'status': Status.OK, 'user_id': 1})
+
+
+@benchmark('helpers.Error.get_exception')
+def bench_get_exception():
+    Errors.NO_REQUIRED_PARAMETERS.get_exception(params='login, password')
+
+
+@benchmark('commons.get_password')
+def bench_get_password():
+    get_password('password')
+
+
+@benchmark('commons.generate_token')
+def bench_generate_token():
+    generate_token(1)
+
+
+USER_VALUES = {'id': 1, 'login': 'login', 'password': 'password', 'first_name': 'First', 'last_name': 'Last'}
+
+
+@benchmark('models.User.from_dict')
+def bench_from_dict():
+    User().from_dict(USER_VALUES)
+
+
+HANDLER_QUERIES = {
+    'principal_by_token': (PRINCIPAL_BY_TOKEN, {'token': 'token'}),
+    'auth_user_by_login': (AUTH_USER_BY_LOGIN, {'login': 'login'}),
+    'update_user_tokens': (UPDATE_USER_TOKENS, {
+        'user_ids': [1, 2], 'tokens': ['token', 'token'], 'passwords': [None, 'password']
+    }),
+    'clear_user_token': (CLEAR_USER_TOKEN, {'user_id': 1}),
+    'user_by_login': (USER_BY_LOGIN, {'login': 'login'}),
+    'insert_user': (INSERT_USER, dict(USER_VALUES)),
+}
+
+
+def _register_query_benchmarks(name, query, values):
+    """Benchmark statement compilation and precompiled query arguments binding."""
+    statement = query._statement
+
+    @benchmark(f'queries.{name}.compile')
+    def bench_compile():
+        Query(statement).sql
+
+    @benchmark(f'queries.{name}.args')
+    def bench_args():
+        query.args(values)
+
+
+for _name, (_query, _values) in HANDLER_QUERIES.items():
+    _register_query_benchmarks(_name, _query, _values)
+
+
+@async_benchmark('app.middleware_chain.ping')
+@asynccontextmanager
+async def bench_middleware_chain():
+    app = init_server()
+    # Ping passes every middleware without touching databases
+    app.on_startup.clear()
+    app.on_shutdown.clear()
+
+    client = TestClient(TestServer(app))
+    await client.start_server()
+
+    async def request():
+        async with client.get('/api/v1/ping/') as response:
+            await response.read()
+
+    try:
+        yield request
+    finally:
+        await client.close()
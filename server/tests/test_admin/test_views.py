@@ -0,0 +1,111 @@
+import pytest
+
+from admin.app import app
+from admin.sessions import replica_session
+from admin.views import ArticleView
+from db.models import Article, Category, User
+
+
+@pytest.fixture
+def articles(db, user_factory, category_factory, article_factory):
+    user = user_factory(first_name='Test', last_name='User', login='author', password='password')
+    category = category_factory(title='news')
+
+    try:
+        yield [
+            article_factory(title=f'Article {i:02}', content='Text', user_id=user.id, category_id=category.id)
+            for i in range(25)
+        ]
+    finally:
+        db.query(Article).delete()
+        db.query(Category).delete()
+        db.query(User).delete()
+
+
+@pytest.fixture
+def view(db):
+    view = ArticleView(Article, db, endpoint='test_article')
+    view.page_size = 10
+    ArticleView.page_boundaries.clear()
+    return view
+
+
+def pages(view, sort_column=None, sort_desc=False, page_numbers=(0, 1, 2)):
+    with app.test_request_context('/'):
+        return [view.get_list(page, sort_column, sort_desc, None, [])[1] for page in page_numbers]
+
+
+def test_keyset_pages(view, articles):
+    ids = [[row.id for row in page] for page in pages(view)]
+
+    assert ids == [
+        [article.id for article in articles[:10]],
+        [article.id for article in articles[10:20]],
+        [article.id for article in articles[20:]],
+    ]
+    assert len(ArticleView.page_boundaries) == 2
+
+
+def test_keyset_pages_sorted_desc(view, articles):
+    titles = [row.title for page in pages(view, 'title', True, (0, 1, 2, 1)) for row in page]
+
+    expected = sorted((article.title for article in articles), reverse=True)
+    assert titles == expected + expected[10:20]
+
+
+def test_jump_falls_back_to_offset(view, articles):
+    [page] = pages(view, page_numbers=(2, ))
+
+    assert [row.id for row in page] == [article.id for article in articles[20:]]
+
+
+def test_counts(view, articles):
+    with app.test_request_context('/'):
+        count, _ = view.get_list(0, None, False, None, [])
+    assert count == 25
+
+    view.count_estimate_threshold = 0
+    with app.test_request_context('/?exact_count=1'):
+        count, _ = view.get_list(0, None, False, None, [])
+    assert count == 25
+
+
+def test_estimated_counts(db, view, articles, mocker):
+    db.execute('ANALYZE article')
+    db.commit()
+    exact_count = mocker.spy(view, '_exact_count')
+    view.count_estimate_threshold = 0
+
+    with app.test_request_context('/'):
+        count, _ = view.get_list(0, None, False, None, [])
+        filtered_count = view._count(view.session.query(Article).filter(Article.title == 'Article 01'), True)
+
+    assert count == 25
+    assert isinstance(filtered_count, int) and filtered_count > 0
+    assert not exact_count.called
+
+
+@pytest.mark.parametrize('url, replica', [
+    ('/article/', True),
+    ('/article/details/?id=1', True),
+    ('/article/export/csv/', True),
+    ('/article/new/', False),
+    ('/article/edit/?id=1', False),
+])
+def test_read_only_views_use_replica(db, url, replica):
+    view = ArticleView(Article, db, endpoint='test_article')
+
+    with app.test_request_context(url):
+        assert (view.session is replica_session) == replica
+        assert (view.session is db) != replica
+
+
+def test_replica_session_per_app_context():
+    with app.app_context():
+        session = replica_session()
+        assert replica_session() is session
+
+        with app.app_context():
+            assert replica_session() is not session
+
+        assert replica_session() is session
@@ -0,0 +1,180 @@
+import pytest
+import ujson
+
+from config import settings
+from api.constants import Status
+from commons.helpers import get_password
+from db.models import Article, Category, User
+
+
+@pytest.fixture
+def articles(db, user_factory, category_factory, article_factory):
+    author = user_factory(first_name='Test', last_name='User', login='author', password=get_password('author'))
+    other = user_factory(first_name='Other', last_name='User', login='other', password=get_password('other'))
+    news, blog = category_factory(title='news'), category_factory(title='blog')
+
+    try:
+        yield [
+            article_factory(title=f'Article {i}', content='Text', user_id=author.id if i % 2 else other.id,
+                            category_id=news.id if i < 5 else blog.id)
+            for i in range(10)
+        ]
+    finally:
+        db.query(Article).delete()
+        db.query(Category).delete()
+        db.query(User).delete()
+
+
+async def get_client(test_client, web_server):
+    client = await test_client(web_server)
+    resp = await client.post('/api/v1/login/', json={'login': 'author', 'password': 'author'})
+    return client, {'token': resp.cookies['token'].value}
+
+
+async def collect(client, cookies, url):
+    pages = []
+    while url:
+        resp = await client.get(url, cookies=cookies)
+        assert resp.status == 200
+        data = await resp.json()
+        pages.append(data['items'])
+        url = data['next_cursor'] and f'{url.split("cursor=")[0].rstrip("&")}&cursor={data["next_cursor"]}'
+    return pages
+
+
+@pytest.mark.asyncio
+async def test_articles_keyset_pages(test_client, web_server, articles):
+    client, cookies = await get_client(test_client, web_server)
+
+    pages = await collect(client, cookies, '/api/v1/articles/?limit=4&fields=title')
+
+    assert [len(page) for page in pages] == [4, 4, 2]
+    items = [item for page in pages for item in page]
+    assert [item['id'] for item in items] == sorted(article.id for article in articles)
+    assert set(items[0]) == {'id', 'title'}
+
+
+@pytest.mark.asyncio
+async def test_articles_filters_and_descending(test_client, web_server, articles):
+    client, cookies = await get_client(test_client, web_server)
+    author_id, news_id = articles[1].user_id, articles[1].category_id
+
+    url = f'/api/v1/articles/?limit=1&sort=-id&user_id={author_id}&category_id={news_id}'
+    pages = await collect(client, cookies, url)
+
+    ids = [item['id'] for page in pages for item in page]
+    expected = [article.id for article in articles if article.user_id == author_id and article.category_id == news_id]
+    assert ids == sorted(expected, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_categories_sorted_by_title(test_client, web_server, articles):
+    client, cookies = await get_client(test_client, web_server)
+
+    pages = await collect(client, cookies, '/api/v1/categories/?limit=1&sort=title')
+
+    assert [item['title'] for page in pages for item in page] == ['blog', 'news']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('query', [
+    'limit=0',
+    'limit=abc',
+    'sort=content',
+    'fields=password',
+    'user_id=abc',
+    'cursor=garbage',
+    'sort=-id&cursor=WyJpZCIsWzFdXQ',
+    'sort=--id',
+    'cursor=WyJpZCIsW3RydWVdXQ',
+])
+async def test_articles_wrong_parameters(test_client, web_server, articles, query):
+    client, cookies = await get_client(test_client, web_server)
+
+    resp = await client.get(f'/api/v1/articles/?{query}', cookies=cookies)
+
+    assert resp.status == 400
+
+
+@pytest.mark.asyncio
+async def test_categories_wrong_cursor_key_type(test_client, web_server, articles):
+    client, cookies = await get_client(test_client, web_server)
+
+    resp = await client.get('/api/v1/categories/?sort=title&cursor=WyJ0aXRsZSIsWzEsMV1d', cookies=cookies)
+
+    assert resp.status == 400
+
+
+@pytest.mark.asyncio
+async def test_articles_unauthorized(test_client, web_server):
+    client = await test_client(web_server)
+
+    resp = await client.get('/api/v1/articles/')
+
+    assert resp.status == 401
+
+
+@pytest.mark.asyncio
+async def test_export_articles(test_client, web_server, articles):
+    client, cookies = await get_client(test_client, web_server)
+
+    with settings.override({'export': {'prefetch': 3, 'chunk_size': 4}}):
+        resp = await client.get('/api/v1/articles/export/', cookies=cookies)
+
+        assert resp.status == 200
+        assert resp.content_type == 'application/x-ndjson'
+
+        lines = (await resp.text()).splitlines()
+
+    rows = [ujson.loads(line) for line in lines]
+    assert [row['id'] for row in rows] == sorted(article.id for article in articles)
+    assert {row['user_login'] for row in rows} == {'author', 'other'}
+    assert {row['category_title'] for row in rows} == {'news', 'blog'}
+
+
+@pytest.mark.asyncio
+async def test_export_articles_failure(test_client, web_server, articles, mocker):
+    class FailingQuery:
+        async def cursor(self, connection, prefetch):
+            yield {'id': 1}
+            raise RuntimeError('connection lost')
+
+    mocker.patch('api.v1.handlers.export.EXPORT_ARTICLES', FailingQuery())
+    client, cookies = await get_client(test_client, web_server)
+
+    with settings.override({'export': {'prefetch': 3, 'chunk_size': 1}}):
+        resp = await client.get('/api/v1/articles/export/', cookies=cookies)
+
+        assert resp.status == 200
+        lines = (await resp.text()).splitlines()
+
+    assert [ujson.loads(line) for line in lines] == [
+        {'id': 1},
+        {'status': Status.ERROR, 'message': 'Export failed, data is incomplete'},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_articles(test_client, web_server, db, articles):
+    articles[3].title = 'Postgres full text search'
+    articles[7].content = 'Searching with prefixes'
+    db.flush()
+
+    client, cookies = await get_client(test_client, web_server)
+
+    pages = await collect(client, cookies, '/api/v1/articles/search/?q=sear&limit=1')
+
+    items = [item for page in pages for item in page]
+    # Title matches are weighted higher
+    assert [item['id'] for item in items] == [articles[3].id, articles[7].id]
+    assert items[0]['rank'] > items[1]['rank']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('query', ['q=', 'q=!!!', 'q=text&cursor=WyJpZCIsWzFdXQ'])
+async def test_search_wrong_parameters(test_client, web_server, articles, query):
+    client, cookies = await get_client(test_client, web_server)
+
+    resp = await client.get(f'/api/v1/articles/search/?{query}', cookies=cookies)
+
+    assert resp.status == 400
@@ -45,3 +45,78 @@ async def test_auth_ok(test_client, web_server, user, mocker, api_method):
     }
 
     assert resp.cookies['token'].value == _TOKEN
+
+
+@pytest.mark.asyncio
+async def test_logout(test_client, web_server, user):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/login/', json={
+        'login': user.login,
+        'password': _USER_PASSWORD
+    })
+    token = resp.cookies['token'].value
+
+    resp = await client.post('/api/v1/logout/', cookies={'token': token})
+    assert resp.status == 200
+    assert await resp.json() == {'status': Status.OK}
+
+    resp = await client.post('/api/v1/logout/', cookies={'token': token})
+    assert resp.status == 401
+
+
+@pytest.mark.asyncio
+async def test_auth_request_too_large(test_client, web_server):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/login/', json={
+        'login': 'x' * 5000,
+        'password': _USER_PASSWORD
+    })
+
+    assert resp.status == 413
+
+
+@pytest.mark.asyncio
+async def test_auth_chunked_request_too_large(test_client, web_server):
+    client = await test_client(web_server)
+
+    async def body():
+        yield b'{"login": "' + b'x' * 5000 + b'", "password": "secret"}'
+
+    resp = await client.post('/api/v1/login/', data=body())
+
+    assert resp.status == 413
+
+
+@pytest.mark.asyncio
+async def test_unknown_suffix_route_not_found(test_client, web_server):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/foo/logout/')
+
+    assert resp.status == 404
+
+
+@pytest.mark.asyncio
+async def test_auth_rehashes_legacy_password(test_client, web_server, user, db):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/login/', json={'login': user.login, 'password': _USER_PASSWORD})
+    assert resp.status == 200
+
+    db.refresh(user)
+    assert user.password.startswith('pbkdf2_sha256$')
+
+    resp = await client.post('/api/v1/login/', json={'login': user.login, 'password': _USER_PASSWORD})
+    assert 'token' in resp.cookies
+
+
+@pytest.mark.asyncio
+async def test_auth_wrong_password(test_client, web_server, user):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/login/', json={'login': user.login, 'password': 'wrong'})
+
+    assert await resp.json() == {'status': Status.ERROR, 'message': 'User not found!'}
+    assert 'token' not in resp.cookies
@@ -0,0 +1,49 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from api.cache import CacheScope, MemoryCacheBackend, ResponseCache
+from api.policies import RoutePolicy
+
+
+@pytest.mark.asyncio
+async def test_response_cache_roundtrip():
+    cache = ResponseCache(MemoryCacheBackend(size=1, ttl=60))
+
+    await cache.set('a', web.json_response({'status': 'ok'}))
+    response = await cache.get('a')
+
+    assert response.status == 200
+    assert response.body == b'{"status": "ok"}'
+    assert response.content_type == 'application/json'
+
+    assert await cache.get('b') is None
+
+    await cache.set('b', web.json_response({'status': 'ok'}))
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1}
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_errors():
+    cache = ResponseCache(MemoryCacheBackend(size=1, ttl=60))
+
+    await cache.set('a', web.json_response({'status': 'error'}, status=500))
+
+    assert await cache.get('a') is None
+
+
+def test_response_cache_key_escapes_query():
+    cache = ResponseCache(MemoryCacheBackend(size=1, ttl=60))
+    policy = RoutePolicy(cacheable=True)
+
+    def key(url):
+        return cache.key(make_mocked_request('GET', url), policy)
+
+    assert key('/api/v1/ping/?b=2&a=1') == key('/api/v1/ping/?a=1&b=2')
+    assert key('/api/v1/ping/?a=1%26b%3D2') != key('/api/v1/ping/?a=1&b=2')
+
+
+def test_route_policy_cache_scope_default():
+    assert RoutePolicy(cacheable=True).cache_scope == CacheScope.PRINCIPAL
+    assert RoutePolicy(auth=False, cacheable=True).cache_scope == CacheScope.PUBLIC
+    assert RoutePolicy(cacheable=True, cache_scope=CacheScope.PUBLIC).cache_scope == CacheScope.PUBLIC
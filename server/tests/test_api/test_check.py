@@ -38,6 +38,9 @@ class FakeClientSession:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
+    async def close(self):
+        pass
+
     def get(self, url, *args, **kwargs):
         if url == self.url:
             if self.status == self.Status.OK:
@@ -68,7 +71,7 @@ async def test_check_ok(
         session_status, response_status, status, mocker):
 
     FakeClientSession.status = session_status
-    mocker.patch('api.v1.handlers.check.ClientSession', FakeClientSession)
+    mocker.patch('api.app.ClientSession', FakeClientSession)
 
     client = await test_client(web_server)
     resp = await client.get(api_method)
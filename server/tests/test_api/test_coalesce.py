@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from api.helpers import json_response
+from api.middlewares import coalesce_middleware
+from api.policies import RoutePolicy
+from commons.singleflight import SingleFlight
+
+
+@pytest.fixture
+def coalesce_server():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.query.get('page'))
+        await asyncio.sleep(0.05)
+        return json_response(data={'page': request.query.get('page')})
+
+    app = web.Application(middlewares=[coalesce_middleware])
+    route = app.router.add_get('/items/', handler)
+    app.route_policies = {route: RoutePolicy(auth=False)}
+    app.request_coalescer = SingleFlight()
+    app.calls = calls
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_coalesce_identical_requests(test_client, coalesce_server):
+    client = await test_client(coalesce_server)
+
+    responses = await asyncio.gather(*[
+        client.get('/items/', params={'page': page}) for page in ('1', '1', '1', '2')
+    ])
+
+    assert [(await resp.json())['page'] for resp in responses] == ['1', '1', '1', '2']
+    assert sorted(coalesce_server.calls) == ['1', '2']
+    assert coalesce_server.request_coalescer.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_per_user(test_client):
+    calls = []
+
+    @web.middleware
+    async def user_middleware(request, handler):
+        request['user'] = {'id': int(request.headers['X-User'])}
+        return await handler(request)
+
+    async def handler(request):
+        calls.append(request['user']['id'])
+        await asyncio.sleep(0.05)
+        return json_response(data={'user': request['user']['id']})
+
+    app = web.Application(middlewares=[user_middleware, coalesce_middleware])
+    route = app.router.add_get('/items/', handler)
+    app.route_policies = {route: RoutePolicy()}
+    app.request_coalescer = SingleFlight()
+    client = await test_client(app)
+
+    responses = await asyncio.gather(*[
+        client.get('/items/', headers={'X-User': user}) for user in ('1', '2', '1')
+    ])
+
+    assert [(await resp.json())['user'] for resp in responses] == [1, 2, 1]
+    assert sorted(calls) == [1, 2]
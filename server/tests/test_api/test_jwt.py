@@ -0,0 +1,55 @@
+import pytest
+
+from api.auth import JWTAuthenticator, RevocationList
+from commons.helpers import generate_token
+
+
+USER = {'id': 42, 'login': 'john', 'first_name': 'John', 'last_name': 'Doe', 'token': None}
+
+
+class FakeQuery:
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, connection, **params):
+        self.calls.append(params)
+
+
+def test_revocation_list():
+    revocations = RevocationList()
+    revocations.revoke(42, 100.5)
+    revocations.revoke(42, 50)
+
+    assert revocations.is_revoked(42, 100)
+    assert revocations.is_revoked(42, 100.5)
+    assert not revocations.is_revoked(42, 100.6)
+    assert not revocations.is_revoked(7, 100)
+    assert len(revocations) == 1
+
+
+@pytest.mark.asyncio
+async def test_jwt_revoke_then_login(mocker):
+    query = mocker.patch('api.auth.REVOKE_USER_TOKENS', FakeQuery())
+    authenticator = JWTAuthenticator(ttl=60, sync_interval=60)
+    principal = {'id': 42, 'login': 'john', 'first_name': 'John', 'last_name': 'Doe'}
+
+    token = generate_token(USER['id'], **authenticator.token_claims(USER))
+    assert await authenticator.authenticate(None, token) == principal
+    assert authenticator.remember(token, USER) == principal
+
+    await authenticator.revoke(None, USER['id'])
+    assert query.calls[0]['b_user_id'] == 42
+    assert await authenticator.authenticate(None, token) is None
+
+    # Login in the same second as logout gets a valid token
+    token = generate_token(USER['id'], **authenticator.token_claims(USER))
+    assert await authenticator.authenticate(None, token) == principal
+
+
+@pytest.mark.asyncio
+async def test_jwt_rejects_expired_and_malformed():
+    authenticator = JWTAuthenticator(ttl=0, sync_interval=60)
+
+    assert await authenticator.authenticate(None, generate_token(42)) is None
+    assert await authenticator.authenticate(None, 'not a token') is None
+    assert await authenticator.authenticate(None, generate_token(True)) is None
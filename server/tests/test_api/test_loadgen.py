@@ -0,0 +1,31 @@
+import pytest
+
+from api.loadgen import LoadMode, run_load, create_stub_upstream
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode, rate', [
+    (LoadMode.OPEN, 200),
+    (LoadMode.CLOSED, 200),
+    (LoadMode.CLOSED, 0),
+])
+async def test_run_load(test_server, mode, rate):
+    server = await test_server(create_stub_upstream())
+
+    result = await run_load(str(server.make_url('')), 'ping', mode=mode, rate=rate, duration=0.2, concurrency=4)
+    report = result.to_dict()
+
+    assert report['latency']['count'] > 0
+    assert report['requests']['ping']['count'] == report['latency']['count']
+    assert report['statuses'] == {'200': report['latency']['count']}
+    assert report['errors'] == {}
+    assert (report['corrected'] is not None) == (mode == LoadMode.CLOSED and rate > 0)
+
+
+@pytest.mark.asyncio
+async def test_run_load_open_loop_rate(test_server):
+    server = await test_server(create_stub_upstream())
+
+    result = await run_load(str(server.make_url('')), 'ping', rate=100, duration=0.5)
+
+    assert result.latency.count == 50
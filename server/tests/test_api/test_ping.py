@@ -16,3 +16,39 @@ async def test_ping(test_client, web_server, api_method):
 
     data = await resp.json()
     assert data == {'status': Status.OK}
+
+
+@pytest.mark.asyncio
+async def test_head(test_client, web_server):
+    client = await test_client(web_server)
+
+    resp = await client.head('/api/v1/ping/')
+    assert resp.status == 200
+
+    # HEAD route is authorized like GET one
+    resp = await client.head('/api/v1/articles/')
+    assert resp.status == 401
+
+
+@pytest.mark.asyncio
+async def test_metrics(test_client, web_server):
+    client = await test_client(web_server)
+    resp = await client.get('/api/v1/metrics/')
+
+    assert resp.status == 200
+
+    text = await resp.text()
+    assert 'db_pool_connections_in_use{pool="master"}' in text
+    assert 'db_pool_checkout_wait_seconds_bucket{pool="async_master",le="+Inf"}' in text
+
+
+@pytest.mark.asyncio
+async def test_route_metrics(test_client, web_server):
+    client = await test_client(web_server)
+    await client.get('/api/v1/ping/')
+
+    resp = await client.get('/api/v1/metrics/')
+    text = await resp.text()
+
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/ping/",status="2xx"}' in text
+    assert 'http_requests_in_flight{method="GET",route="/api/v1/metrics/"} 1' in text
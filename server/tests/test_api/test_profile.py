@@ -0,0 +1,41 @@
+import pytest
+
+from config import settings
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('admin_token, headers', [
+    (None, {}),
+    (None, {'X-Admin-Token': ''}),
+    ('secret', {}),
+    ('secret', {'X-Admin-Token': 'wrong'}),
+])
+async def test_profile_forbidden(test_client, web_server, admin_token, headers):
+    with settings.override({'profiler': {'admin_token': admin_token}}):
+        client = await test_client(web_server)
+        resp = await client.get('/api/v1/profile/', headers=headers)
+
+    assert resp.status == 403
+
+
+@pytest.mark.asyncio
+async def test_profile(test_client, web_server):
+    with settings.override({'profiler': {'admin_token': 'secret'}}):
+        client = await test_client(web_server)
+        resp = await client.get('/api/v1/profile/?seconds=0.1', headers={'X-Admin-Token': 'secret'})
+
+        assert resp.status == 200
+        assert resp.content_type == 'text/plain'
+
+        lines = (await resp.text()).splitlines()
+        assert any(line.startswith('MainThread;') for line in lines)
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_profile_wrong_seconds(test_client, web_server):
+    with settings.override({'profiler': {'admin_token': 'secret'}}):
+        client = await test_client(web_server)
+        resp = await client.get('/api/v1/profile/?seconds=abc', headers={'X-Admin-Token': 'secret'})
+
+    assert resp.status == 400
@@ -0,0 +1,80 @@
+import pytest
+import ujson
+
+from api.constants import BulkStatus, Status
+from commons.helpers import get_password
+from db.models import User
+
+
+@pytest.fixture
+def admin(db, user_factory):
+    user_factory(first_name='Admin', last_name='User', login='admin', password=get_password('admin'))
+
+    try:
+        yield
+    finally:
+        db.query(User).delete()
+
+
+async def login(client):
+    resp = await client.post('/api/v1/login/', json={'login': 'admin', 'password': 'admin'})
+    return resp.cookies['token'].value
+
+
+def new_user(login):
+    return {'login': login, 'password': login, 'first_name': 'First', 'last_name': 'Last'}
+
+
+@pytest.mark.asyncio
+async def test_bulk_register(test_client, web_server, admin, db):
+    client = await test_client(web_server)
+    cookies = {'token': await login(client)}
+
+    resp = await client.post('/api/v1/register/bulk/', cookies=cookies, json=[
+        new_user('first'),
+        new_user('admin'),
+        new_user('first'),
+        {'login': 'invalid'},
+        new_user('second'),
+    ])
+
+    assert resp.status == 200
+    data = await resp.json()
+    assert data['status'] == Status.OK
+
+    statuses = [item['status'] for item in data['users']]
+    assert statuses == [
+        BulkStatus.CREATED, BulkStatus.CONFLICT, BulkStatus.CONFLICT, BulkStatus.INVALID, BulkStatus.CREATED
+    ]
+
+    ids = {user.login: user.id for user in db.query(User)}
+    assert [item['user_id'] for item in data['users']] == [
+        ids['first'], ids['admin'], ids['first'], None, ids['second']
+    ]
+
+    resp = await client.post('/api/v1/login/', json={'login': 'second', 'password': 'second'})
+    assert 'token' in resp.cookies
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_ndjson(test_client, web_server, admin, db):
+    client = await test_client(web_server)
+    cookies = {'token': await login(client)}
+
+    body = '\n'.join(ujson.dumps(new_user(f'user{i}')) for i in range(100))
+    resp = await client.post(
+        '/api/v1/register/bulk/', cookies=cookies, data=body, headers={'Content-Type': 'application/x-ndjson'}
+    )
+
+    data = await resp.json()
+    assert [item['status'] for item in data['users']] == [BulkStatus.CREATED] * 100
+    assert db.query(User).count() == 101
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_unauthorized(test_client, web_server):
+    client = await test_client(web_server)
+
+    resp = await client.post('/api/v1/register/bulk/', json=[new_user('first')])
+
+    assert resp.status == 401
@@ -0,0 +1,32 @@
+import pytest
+
+from ..benchmarks.runner import compare, measure, measure_async
+
+
+def test_measure():
+    calls = []
+
+    result = measure(lambda: calls.append(1), repeat=3, min_time=0.001)
+
+    assert result['repeat'] == 3
+    assert result['number'] >= 1
+    assert 0 < result['min'] <= result['median']
+
+
+@pytest.mark.asyncio
+async def test_measure_async():
+    async def operation():
+        pass
+
+    result = await measure_async(operation, repeat=2, min_time=0.001)
+
+    assert result['repeat'] == 2
+    assert result['min'] > 0
+
+
+def test_compare():
+    baseline = {'fast': {'min': 100}, 'slow': {'min': 100}, 'removed': {'min': 100}}
+    results = {'fast': {'min': 105}, 'slow': {'min': 150}, 'new': {'min': 1000}}
+
+    assert compare(results, baseline, 0.1) == [('slow', 100, 150, 1.5)]
+    assert compare(results, baseline, 0.6) == []
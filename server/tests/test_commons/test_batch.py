@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from commons.batch import BatchWriter
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_coalesces_writes():
+    batches = []
+
+    async def write(items):
+        batches.append(items)
+
+    writer = BatchWriter(write, max_size=3, max_delay=0.01)
+
+    await asyncio.gather(*[writer.write(i) for i in range(5)])
+
+    assert batches == [[0, 1, 2], [3, 4]]
+    assert (writer.batches, writer.written, len(writer)) == (2, 5, 0)
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_propagates_errors():
+    async def write(items):
+        raise RuntimeError('write failed')
+
+    writer = BatchWriter(write, max_size=10, max_delay=0.001)
+
+    results = await asyncio.gather(writer.write(1), writer.write(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert writer.batches == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_close_flushes_pending():
+    written = []
+
+    async def write(items):
+        written.extend(items)
+
+    writer = BatchWriter(write, max_size=10, max_delay=60)
+    task = asyncio.ensure_future(writer.write('item'))
+    await asyncio.sleep(0)
+
+    await writer.close()
+    await task
+
+    assert written == ['item']
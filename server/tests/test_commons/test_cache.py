@@ -0,0 +1,35 @@
+from commons.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expiration():
+    timer = FakeTimer()
+    cache = TTLCache(10, 5, timer=timer)
+
+    cache.set('token', {'id': 1})
+    assert cache.get('token') == {'id': 1}
+
+    timer.now = 5
+    assert cache.get('token') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(2, 60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.pop('c') == 3
+    assert cache.pop('c') is None
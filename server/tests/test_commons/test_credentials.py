@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from commons.credentials import (
+    CredentialsBusy, CredentialService, PasswordHasher, PBKDF2Scheme, SHA512Scheme
+)
+from commons.helpers import get_password
+
+
+@pytest.fixture
+def hasher():
+    return PasswordHasher((PBKDF2Scheme(1000), SHA512Scheme()), 'pbkdf2_sha256')
+
+
+def test_hash_and_verify(hasher):
+    encoded = hasher.hash('secret')
+
+    assert encoded.startswith('pbkdf2_sha256$1000$')
+    assert encoded != hasher.hash('secret')
+    assert hasher.verify('secret', encoded) == (True, None)
+    assert hasher.verify('wrong', encoded) == (False, None)
+
+
+def test_verify_rehashes_legacy(hasher):
+    valid, new_password = hasher.verify('secret', get_password('secret'))
+
+    assert valid
+    assert hasher.verify('secret', new_password) == (True, None)
+    assert hasher.verify('wrong', get_password('secret')) == (False, None)
+
+
+def test_verify_rehashes_outdated_iterations(hasher):
+    encoded = PBKDF2Scheme(500).hash('secret')
+
+    valid, new_password = hasher.verify('secret', encoded)
+
+    assert valid
+    assert new_password.startswith('pbkdf2_sha256$1000$')
+
+
+def test_verify_unknown_user_hashes_dummy(hasher, mocker):
+    encode = mocker.spy(PBKDF2Scheme, '_encode')
+
+    assert hasher.verify('secret', None) == (False, None)
+    assert encode.call_count == 1
+
+
+def test_verify_malformed_hash(hasher):
+    assert hasher.verify('secret', 'pbkdf2_sha256$broken') == (False, None)
+    assert hasher.verify('secret', 'pbkdf2_sha256$many$salt$digest') == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_credential_service_rejects_when_saturated():
+    started, release = threading.Event(), threading.Event()
+
+    class BlockingHasher:
+        def hash(self, password):
+            started.set()
+            release.wait()
+            return password
+
+    service = CredentialService(BlockingHasher(), workers=1, queue_size=1)
+    try:
+        first = asyncio.ensure_future(service.hash('first'))
+        second = asyncio.ensure_future(service.hash('second'))
+        await asyncio.sleep(0)
+
+        with pytest.raises(CredentialsBusy):
+            await service.hash('third')
+        assert (service.pending, service.rejected) == (2, 1)
+
+        release.set()
+        assert await asyncio.gather(first, second) == ['first', 'second']
+
+        await asyncio.sleep(0)
+        assert service.pending == 0
+    finally:
+        release.set()
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_credential_service_hash_many_in_chunks():
+    lock = threading.Lock()
+    calls = []
+    running = [0, 0]
+
+    class RecordingHasher:
+        def hash_many(self, passwords):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            calls.append(len(passwords))
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return [password.upper() for password in passwords]
+
+    service = CredentialService(RecordingHasher(), workers=4, queue_size=4, chunk_size=2)
+    try:
+        passwords = [f'p{i}' for i in range(7)]
+
+        assert await service.hash_many(passwords) == [password.upper() for password in passwords]
+        assert sorted(calls) == [1, 2, 2, 2]
+        assert running[1] <= 2
+
+        await asyncio.sleep(0)
+        assert service.pending == 0
+    finally:
+        service.shutdown()
@@ -0,0 +1,19 @@
+import jwt
+import pytest
+
+from commons.helpers import encode_token, generate_token
+
+
+def test_encode_token():
+    claims = encode_token(generate_token(42, login='john'))
+
+    assert claims['user_id'] == 42
+    assert claims['login'] == 'john'
+    assert isinstance(claims['created_at'], float)
+
+
+def test_encode_token_wrong_signature():
+    token = jwt.encode({'user_id': 42}, 'wrong', algorithm='HS256').decode('utf-8')
+
+    with pytest.raises(jwt.InvalidTokenError):
+        encode_token(token)
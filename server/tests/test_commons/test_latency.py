@@ -0,0 +1,46 @@
+import pytest
+
+from commons.latency import LatencyHistogram
+
+
+def test_percentiles_relative_error():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+    assert histogram.percentile(100) == 1.0
+
+    summary = histogram.to_dict()
+    assert summary['min'] == 1
+    assert summary['max'] == 1000
+    assert summary['mean'] == pytest.approx(500.5)
+
+
+def test_record_corrected():
+    histogram = LatencyHistogram()
+    histogram.record_corrected(1.0, 0.1)
+
+    assert histogram.count == 10
+    assert histogram.percentile(10) == pytest.approx(0.1, rel=0.01)
+    assert histogram.percentile(100) == 1.0
+
+
+def test_merge():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(0.001)
+    second.record(0.002, count=3)
+
+    first.merge(second)
+
+    assert first.count == 4
+    assert first.percentile(50) == pytest.approx(0.002, rel=0.01)
+
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(significant_bits=4))
+
+
+def test_empty():
+    assert LatencyHistogram().to_dict()['p99'] == 0
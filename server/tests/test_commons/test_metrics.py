@@ -0,0 +1,36 @@
+from commons.metrics import Counter, Histogram, Registry
+
+
+def test_registry_render():
+    registry = Registry()
+    requests = registry.register(Counter('requests_total', 'Requests.', ('route', )))
+    latency = registry.register(Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1)))
+
+    requests.labels('ping').inc()
+    latency.labels().observe(0.1)
+    latency.labels().observe(5)
+
+    assert registry.render() == '\n'.join([
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{route="ping"} 1',
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        'latency_seconds_sum 5.1',
+        'latency_seconds_count 2',
+    ]) + '\n'
+
+
+def test_registry_render_skips_failed_collector():
+    registry = Registry()
+    registry.register(Counter('requests_total', 'Requests.'))
+
+    def collector():
+        raise RuntimeError('boom')
+
+    registry.add_collector(collector)
+
+    assert registry.render() == '# HELP requests_total Requests.\n# TYPE requests_total counter\n'
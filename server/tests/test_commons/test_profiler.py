@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from commons.profiler import ProfilerBusy, SamplingProfiler
+
+
+def spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_profile_samples_other_threads():
+    stop = threading.Event()
+    thread = threading.Thread(target=spin, args=(stop, ), name='spinner')
+    thread.start()
+
+    try:
+        stacks = await SamplingProfiler(0.001).profile(0.1)
+    finally:
+        stop.set()
+        thread.join()
+
+    spinner = [stack for stack in stacks if stack.startswith('spinner;')]
+    assert spinner
+    assert all(';spin (' in stack for stack in spinner)
+    assert not any(stack.startswith('profiler;') for stack in stacks)
+
+
+@pytest.mark.asyncio
+async def test_profile_busy():
+    profiler = SamplingProfiler(0.001)
+    started = time.monotonic()
+
+    first = profiler.profile(0.1)
+    task = asyncio.ensure_future(first)
+    await asyncio.sleep(0)
+
+    assert profiler.running
+    with pytest.raises(ProfilerBusy):
+        await profiler.profile(0.1)
+
+    await task
+    assert not profiler.running
+    assert time.monotonic() - started >= 0.1
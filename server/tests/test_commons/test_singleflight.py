@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from commons.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'alive'
+
+    results = await asyncio.gather(*[flight.do('key', probe) for _ in range(10)])
+
+    assert results == ['alive'] * 10
+    assert len(calls) == 1
+    assert (flight.executed, flight.coalesced) == (1, 9)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiter_cancellation():
+    flight = SingleFlight()
+
+    async def probe():
+        await asyncio.sleep(0.01)
+        return 'alive'
+
+    cancelled = asyncio.ensure_future(flight.do('key', probe))
+    waiter = asyncio.ensure_future(flight.do('key', probe))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiter == 'alive'
@@ -1,6 +1,26 @@
 import pytest
 
 from db import db_manager, connection_manager
+from db.manager import ReplicaPools
+
+
+class FakePool:
+    def __init__(self, name):
+        self.name = name
+
+    def acquire(self):
+        return FakeConnectionContext(self.name)
+
+
+class FakeConnectionContext:
+    def __init__(self, name):
+        self.name = name
+
+    async def __aenter__(self):
+        return self.name
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
 
 
 @pytest.mark.asyncio
@@ -25,6 +45,8 @@ async def test_async_connection_manager_context(event_loop):
         async with conn.transaction():
             await conn.fetchrow('SELECT * FROM pg_stat_activity LIMIT 1')
 
+    await db_manager.async_close_master()
+
 
 @pytest.mark.asyncio
 async def test_async_connection_manager(event_loop):
@@ -35,3 +57,34 @@ async def test_async_connection_manager(event_loop):
         await conn.fetchrow('SELECT * FROM pg_stat_activity LIMIT 1')
 
     await manager.close()
+    await db_manager.async_close_master()
+
+
+@pytest.mark.asyncio
+async def test_async_replicas_least_outstanding(event_loop):
+    replicas = await db_manager.async_slaves()
+
+    async with replicas.acquire() as conn:
+        assert sum(replicas.outstanding) == 1
+        await conn.fetchrow('SELECT 1')
+
+    assert sum(replicas.outstanding) == 0
+    await db_manager.async_close_slaves()
+
+
+@pytest.mark.asyncio
+async def test_replica_pools_route_to_least_outstanding():
+    replicas = ReplicaPools([FakePool('first'), FakePool('second'), FakePool('third')])
+
+    async with replicas.acquire() as held:
+        async with replicas.acquire() as other:
+            assert other != held
+
+            # The only idle replica is chosen whichever is next in round-robin order
+            for _ in range(3):
+                async with replicas.acquire() as idle:
+                    assert idle not in (held, other)
+
+        assert replicas.outstanding.count(1) == 1
+
+    assert replicas.outstanding == (0, 0, 0)
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from db.engines import ENGINES
+from db.health import ReplicaMonitor
+
+
+def test_replica_monitor_probe():
+    engine = ENGINES['slaves'][0]
+    monitor = ReplicaMonitor([engine], interval=60, max_lag=10, timeout=3)
+
+    monitor.probe(monitor._states[id(engine)])
+
+    assert monitor.choose([engine]) is engine
+    monitor.stop()
+
+
+def test_replica_monitor_ejects_unhealthy_replica():
+    engine = ENGINES['slaves'][0]
+    monitor = ReplicaMonitor([engine], interval=60, max_lag=10, timeout=3)
+
+    state = monitor._states[id(engine)]
+    state.healthy = False
+
+    assert monitor.choose([engine]) is None
+    monitor.stop()
+
+
+def test_replica_monitor_ejects_lagging_replica(mocker):
+    mocker.patch('db.health.logger')
+    mocker.patch('db.health.replica_name', return_value='replica')
+    engine = mocker.MagicMock()
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.scalar.return_value = 30
+    monitor = ReplicaMonitor([engine], interval=60, max_lag=10, timeout=3)
+
+    state = monitor._states[id(engine)]
+    monitor.probe(state)
+
+    assert state.lag == 30
+    assert not state.healthy
+    assert monitor.choose([engine]) is None
+    monitor.stop()
+
+    connection.execute.return_value.scalar.return_value = 5
+    monitor.probe(state)
+
+    assert state.healthy
+    assert monitor.choose([engine]) is engine
+    monitor.stop()
+
+
+def test_replica_monitor_survives_failed_probe(mocker):
+    engine = ENGINES['slaves'][0]
+    monitor = ReplicaMonitor([engine], interval=0.01, max_lag=10, timeout=3)
+    probe = mocker.patch.object(monitor, 'probe', side_effect=RuntimeError('boom'))
+
+    threads = set(threading.enumerate())
+    monitor.choose([engine])
+    [thread] = set(threading.enumerate()) - threads
+    time.sleep(0.1)
+
+    assert probe.call_count > 1
+    assert thread.is_alive()
+    monitor.stop()
+
+
+def test_replica_monitor_restart(mocker):
+    engine = ENGINES['slaves'][0]
+    monitor = ReplicaMonitor([engine], interval=60, max_lag=10, timeout=3)
+    mocker.patch.object(monitor, 'probe')
+
+    monitor.choose([engine])
+    first = monitor._thread
+    monitor.stop()
+    monitor.choose([engine])
+    second = monitor._thread
+
+    first.join(1)
+    assert not first.is_alive()
+    assert second is not first and second.is_alive()
+    monitor.stop()
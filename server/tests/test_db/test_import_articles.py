@@ -0,0 +1,68 @@
+import csv
+
+import pytest
+import ujson
+
+from db.migrations.tasks.import_articles import import_articles
+from db.models import Article, Category, User
+
+
+@pytest.fixture
+def author(db, user_factory, category_factory):
+    user = user_factory(first_name='Test', last_name='User', login='author', password='password')
+    category = category_factory(title='news')
+
+    try:
+        yield user, category
+    finally:
+        db.query(Article).delete()
+        db.query(Category).delete()
+        db.query(User).delete()
+
+
+def test_import_ndjson(invoke_context, db, author, tmpdir):
+    user, category = author
+    path = tmpdir.join('articles.ndjson')
+    path.write('\n'.join(ujson.dumps(row) for row in [
+        {'title': 'By ids', 'content': 'Text', 'category_id': category.id, 'user_id': user.id},
+        {'title': 'By names', 'content': 'Text', 'category': 'news', 'user': 'author'},
+        {'title': 'Unknown user', 'content': 'Text', 'category': 'news', 'user': 'nobody'},
+        {'title': 'New category', 'content': 'Text', 'category': 'blog', 'user': 'author'},
+    ]))
+
+    import_articles(invoke_context, str(path), workers=2, chunk_size=1)
+
+    assert sorted(title for title, in db.query(Article.title)) == ['By ids', 'By names']
+
+
+def test_import_skips_malformed_rows(invoke_context, db, author, tmpdir):
+    user, category = author
+    path = tmpdir.join('articles.ndjson')
+    path.write('\n'.join([
+        ujson.dumps({'title': 'Valid', 'content': 'Text', 'category_id': category.id, 'user_id': user.id}),
+        ujson.dumps({'title': 'Bad id', 'content': 'Text', 'category_id': 'abc', 'user_id': user.id}),
+        ujson.dumps({'title': 'Bad id by name', 'content': 'Text', 'category_id': 'abc', 'category': 'news',
+                     'user_id': 2 ** 40, 'user': 'author'}),
+        ujson.dumps(['not', 'an', 'object']),
+        '{broken json',
+    ]))
+
+    import_articles(invoke_context, str(path), workers=2, chunk_size=2)
+
+    assert sorted(title for title, in db.query(Article.title)) == ['Bad id by name', 'Valid']
+
+
+def test_import_csv_create_categories(invoke_context, db, author, tmpdir):
+    path = tmpdir.join('articles.csv')
+    with open(str(path), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=('title', 'content', 'category', 'user'))
+        writer.writeheader()
+        for i in range(10):
+            writer.writerow({'title': f'Article {i}', 'content': 'Multi\nline', 'category': 'blog', 'user': 'author'})
+
+    import_articles(invoke_context, str(path), workers=2, chunk_size=3, create_categories=True)
+
+    articles = db.query(Article).all()
+    assert len(articles) == 10
+    assert {article.category.title for article in articles} == {'blog'}
+    assert {article.content for article in articles} == {'Multi\nline'}
@@ -0,0 +1,21 @@
+from sqlalchemy import inspect
+
+from db.migrations.tasks.index_advisor import _predicate_columns
+
+
+def test_lookup_indexes(db):
+    inspector = inspect(db.get_bind())
+
+    user_indexes = {index['name']: index for index in inspector.get_indexes('user')}
+    assert user_indexes['ix_user_login']['unique']
+    assert 'ix_user_token' in user_indexes
+
+    article_indexes = {index['name'] for index in inspector.get_indexes('article')}
+    assert {'ix_article_user_id', 'ix_article_category_id'} <= article_indexes
+
+
+def test_predicate_columns():
+    query = 'SELECT * FROM article WHERE article.title = $1 AND "content" LIKE $2 ORDER BY id'
+
+    assert _predicate_columns(query, 'article', ['title', 'content', 'id']) == {'title', 'content'}
+    assert _predicate_columns(query, 'category', ['title']) == set()
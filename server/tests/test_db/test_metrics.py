@@ -0,0 +1,32 @@
+import time
+
+from db.metrics import CheckoutTracker
+
+
+def test_checkout_tracker_reports_leak_once(mocker):
+    logger = mocker.patch('db.metrics.logger')
+    tracker = CheckoutTracker(threshold=0, capture_stacks=True)
+    tracker.start('connection', 'master')
+
+    assert tracker.leaks() == {'master': 1}
+    assert tracker.leaks() == {'master': 1}
+
+    logger.warning.assert_called_once()
+    assert logger.warning.call_args[1]['pool'] == 'master'
+    assert 'test_checkout_tracker_reports_leak_once' in logger.warning.call_args[1]['stack']
+
+    tracker.stop('connection')
+    assert tracker.leaks() == {}
+
+
+def test_checkout_tracker_watches_leaks(mocker):
+    logger = mocker.patch('db.metrics.logger')
+    tracker = CheckoutTracker(threshold=0, capture_stacks=False, watch=True)
+    tracker.start('connection', 'master')
+
+    deadline = time.monotonic() + 3
+    while not logger.warning.called and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert logger.warning.call_args[1]['pool'] == 'master'
+    tracker.stop('connection')
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from config import settings
+from db.pools import AdaptivePool, PoolKind, get_pool_limits
+
+
+class FakeConnection:
+    async def fetchval(self, query):
+        return query
+
+
+class FakePool:
+    async def acquire(self):
+        return FakeConnection()
+
+    async def release(self, connection):
+        pass
+
+
+def test_pool_limits_explicit():
+    assert get_pool_limits({'dsn': 'db', 'pool_size': 5, 'max_overflow': 2}, PoolKind.SYNC) == (5, 7)
+
+
+def test_pool_limits_from_budget(monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '2')
+
+    with settings.override({'pools': {'max_connections': 110, 'reserved_connections': 10}}):
+        database = {'dsn': 'postgresql://replica/db'}
+        min_size, max_size = get_pool_limits(database, PoolKind.ASYNC)
+
+    assert max_size == int(50 * settings.pools.shares['async'])
+    assert min_size == max_size // 4
+
+
+@pytest.mark.asyncio
+async def test_adaptive_pool_grows_on_wait(event_loop):
+    pool = AdaptivePool(FakePool(), min_size=1, max_size=4, wait_target=0, adjust_interval=0, loop=event_loop)
+
+    async def query():
+        async with pool.acquire():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[query() for _ in range(4)])
+
+    assert pool.limit > 1
+    assert pool.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_pool_query_within_limit(event_loop):
+    pool = AdaptivePool(FakePool(), min_size=1, max_size=1, wait_target=1, adjust_interval=60, loop=event_loop)
+
+    async with pool.acquire():
+        query = asyncio.ensure_future(pool.fetchval('SELECT 1'), loop=event_loop)
+        await asyncio.sleep(0.01)
+        assert not query.done()
+
+    assert await query == 'SELECT 1'
+    assert pool.in_use == 0
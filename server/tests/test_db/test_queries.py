@@ -0,0 +1,20 @@
+from sqlalchemy import bindparam, select, update
+
+from db.models import User
+from db.queries import Query
+
+
+def test_query_compiled_once():
+    query = Query(
+        update(User).where(User.id == bindparam('user_id')).values(token=bindparam('b_token'))
+    )
+
+    assert query.sql == 'UPDATE "user" SET token=$1 WHERE "user".id = $2'
+    assert query.sql is query.sql
+    assert query.args({'user_id': 1, 'b_token': 'token'}) == ['token', 1]
+
+
+def test_query_literal_defaults():
+    query = Query(select([User.id]).where(User.login == bindparam('login')).where(User.token == 'fixed'))
+
+    assert query.args({'login': 'test'}) == ['test', 'fixed']